@@ -0,0 +1,157 @@
+"""Пакетный перевод списка слов без графического интерфейса.
+
+Примеры:
+    python batch_translate.py words.txt -o result.jsonl --checkpoint result.ckpt
+    cat words.txt | python batch_translate.py - --workers 16 --rate dictionary.yandex.net=3
+"""
+import os
+import sys
+import json
+import argparse
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from dictionary_engine import DictionaryEngine
+from lookup_cache import LookupCache
+
+# Ограничения по умолчанию (запросов в секунду на хост)
+DEFAULT_RATE_LIMITS = {
+    'api.dictionaryapi.dev': 10.0,
+    'dictionary.yandex.net': 5.0
+}
+
+
+def read_words(stream):
+    """Слова из потока: по одному на строку, пустые строки пропускаются"""
+    for line in stream:
+        word = line.strip()
+        if word:
+            yield word
+
+
+def load_checkpoint(path):
+    """Сколько слов уже записано и до какого байта выходного файла"""
+    if not path or not os.path.exists(path):
+        return 0, 0
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    return state.get("done", 0), state.get("offset", 0)
+
+
+def save_checkpoint(path, done, offset):
+    """Атомарная запись контрольной точки"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"done": done, "offset": offset}, f)
+    os.replace(tmp_path, path)
+
+
+def translate_one(engine, word):
+    """Поиск одного слова, ошибки превращаются в запись с полем error"""
+    language = engine.detect_language(word)
+    if not language:
+        return {"word": word, "error": "Не удалось определить язык слова"}
+    try:
+        return {"word": word, "result": engine.lookup_word(word, language).to_dict()}
+    except Exception as e:
+        return {"word": word, "error": str(e)}
+
+
+def run_batch(engine, words, output, workers=8, start=0, checkpoint=None, checkpoint_every=100):
+    """Перевод слов с ограниченным параллелизмом.
+
+    Результаты пишутся в output (бинарный поток) строго в порядке ввода.
+    Возвращает количество обработанных слов с учетом start.
+    """
+    done = start
+    window = deque()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch")
+
+    def emit(future):
+        nonlocal done
+        record = future.result()
+        output.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        done += 1
+        if checkpoint and done % checkpoint_every == 0:
+            output.flush()
+            save_checkpoint(checkpoint, done, output.tell())
+
+    try:
+        # Скользящее окно: не больше 2 * workers слов в работе одновременно
+        for word in itertools.islice(words, start, None):
+            window.append(pool.submit(translate_one, engine, word))
+            if len(window) >= workers * 2:
+                emit(window.popleft())
+        while window:
+            emit(window.popleft())
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        output.flush()
+        if checkpoint:
+            save_checkpoint(checkpoint, done, output.tell())
+
+    return done
+
+
+def parse_rate_limits(values):
+    """Разбор аргументов вида host=rps"""
+    limits = dict(DEFAULT_RATE_LIMITS)
+    for value in values or []:
+        host, _, rate = value.partition("=")
+        limits[host.strip()] = float(rate)
+    return limits
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетный перевод слов (русский ↔ английский) в JSONL")
+    parser.add_argument("input", help="файл со словами по одному на строку или '-' для stdin")
+    parser.add_argument("-o", "--output", help="выходной JSONL файл (по умолчанию stdout)")
+    parser.add_argument("--workers", type=int, default=8, help="число одновременных поисков")
+    parser.add_argument("--rate", action="append", metavar="HOST=RPS",
+                        help="ограничение запросов в секунду для хоста (можно повторять)")
+    parser.add_argument("--checkpoint", help="файл контрольной точки для продолжения прерванного запуска")
+    parser.add_argument("--no-cache", action="store_true", help="не использовать дисковый кэш")
+    args = parser.parse_args(argv)
+
+    if args.checkpoint and not args.output:
+        parser.error("--checkpoint требует --output")
+
+    cache = LookupCache(db_path=":memory:") if args.no_cache else None
+    engine = DictionaryEngine(cache=cache, rate_limits=parse_rate_limits(args.rate),
+                              upstream_workers=args.workers * 2)
+
+    start, offset = load_checkpoint(args.checkpoint)
+    input_stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+
+    if args.output and start and (not os.path.exists(args.output) or os.path.getsize(args.output) < offset):
+        # Выходной файл удален или короче, чем записано в контрольной точке - начинаем сначала
+        print("Выходной файл не совпадает с контрольной точкой, перевод начинается сначала", file=sys.stderr)
+        start, offset = 0, 0
+
+    if args.output:
+        # При продолжении отрезаем строки, записанные после последней контрольной точки
+        output = open(args.output, "r+b" if start else "wb")
+        output.truncate(offset)
+        output.seek(offset)
+    else:
+        output = sys.stdout.buffer
+
+    try:
+        done = run_batch(engine, read_words(input_stream), output, workers=args.workers,
+                         start=start, checkpoint=args.checkpoint)
+    except KeyboardInterrupt:
+        print("\nПрервано. Запустите ту же команду снова, чтобы продолжить.", file=sys.stderr)
+        return 130
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output is not sys.stdout.buffer:
+            output.close()
+
+    print(f"Обработано слов: {done}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Замер скорости декодирования и разбора больших ответов словарей.
+
+Запуск:
+    python bench_parsers.py --senses 300 --repeat 2000
+"""
+import sys
+import json
+import time
+import argparse
+
+import response_parsers
+from result_model import LookupResult
+
+PARTS_OF_SPEECH = ('noun', 'verb', 'adjective', 'adverb')
+
+
+def make_english_response(senses, entries=3):
+    """Синтетический ответ dictionaryapi.dev: несколько статей, senses значений всего"""
+    data = []
+    per_entry = max(1, senses // entries)
+    for e in range(entries):
+        meanings = []
+        for m, pos in enumerate(PARTS_OF_SPEECH):
+            definitions = [{
+                'definition': f"definition {e}.{m}.{d} of the word",
+                'synonyms': [f"syn{d % 17}", f"syn{(d + 3) % 17}"],
+                'antonyms': [],
+                'example': f"example sentence {d}" if d % 2 else ''
+            } for d in range(per_entry // len(PARTS_OF_SPEECH))]
+            meanings.append({'partOfSpeech': pos, 'definitions': definitions, 'synonyms': [f"syn{m}"]})
+        data.append({
+            'word': 'set',
+            'phonetic': '' if e == 0 else '/sɛt/',
+            'phonetics': [{'text': ''}, {'text': '/sɛt/', 'audio': ''}],
+            'origin': f"origin {e}",
+            'meanings': meanings
+        })
+    return data
+
+
+def make_russian_response(senses):
+    """Синтетический ответ Яндекс.Словаря с senses переводами"""
+    definitions = []
+    for pos in PARTS_OF_SPEECH:
+        definitions.append({
+            'text': 'ставить',
+            'pos': pos,
+            'ts': 'stavitʲ',
+            'tr': [{
+                'text': f"translation {pos} {t}",
+                'pos': pos,
+                'syn': [{'text': f"syn{t % 11}"}],
+                'ex': [{'text': f"пример {t}", 'tr': [{'text': f"example {t}"}]}]
+            } for t in range(senses // len(PARTS_OF_SPEECH))]
+        })
+    return {'head': {}, 'def': definitions}
+
+
+def empty_result(language):
+    return LookupResult('SET', language)
+
+
+def measure(label, func, repeat):
+    """Среднее время одного вызова в микросекундах"""
+    func()  # прогрев
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<38} {elapsed * 1e6:10.1f} мкс")
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замер разбора ответов словарей")
+    parser.add_argument("--senses", type=int, default=300, help="число значений в ответе")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    english = make_english_response(args.senses)
+    russian = make_russian_response(args.senses)
+    english_raw = json.dumps(english, ensure_ascii=False).encode("utf-8")
+    russian_raw = json.dumps(russian, ensure_ascii=False).encode("utf-8")
+
+    print(f"Значений: {args.senses}, размер ответов: {len(english_raw)} и {len(russian_raw)} байт")
+    print(f"Декодер: {'orjson' if response_parsers.orjson is not None else 'json'}")
+
+    measure("json.loads (en)", lambda: json.loads(english_raw), args.repeat)
+    measure("response_parsers.loads (en)", lambda: response_parsers.loads(english_raw), args.repeat)
+    measure("json.loads (ru)", lambda: json.loads(russian_raw), args.repeat)
+    measure("response_parsers.loads (ru)", lambda: response_parsers.loads(russian_raw), args.repeat)
+
+    measure("parse_english_response", lambda: response_parsers.parse_english_response(
+        english, 'set', empty_result('en')), args.repeat)
+    measure("parse_russian_response", lambda: response_parsers.parse_russian_response(
+        russian, 'ставить', empty_result('ru')), args.repeat)
+    measure("extract_russian_translations", lambda: response_parsers.extract_russian_translations(russian),
+            args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
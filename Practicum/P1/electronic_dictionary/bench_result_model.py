@@ -0,0 +1,64 @@
+"""Замер памяти на одну запись: словарь старого формата против LookupResult.
+
+Записи создаются так же, как при чтении кэша с диска: из JSON.
+
+Запуск:
+    python bench_result_model.py --entries 20000 --senses 12
+"""
+import gc
+import sys
+import json
+import argparse
+import tracemalloc
+
+from bench_parsers import make_english_response
+from response_parsers import parse_english_response
+from result_model import LookupResult
+
+
+def make_payloads(count, senses):
+    """JSON записей кэша для count разных слов"""
+    template = make_english_response(senses)
+    payloads = []
+    for i in range(count):
+        word = f"word{i}"
+        result = parse_english_response(template, word, LookupResult(word, 'en'))
+        data = result.to_dict()
+        # Тексты значений у каждого слова свои, синонимы и части речи повторяются
+        for item in data['translation']:
+            item['meaning'] = f"{item['meaning']} ({word})"
+        data['russian_translation'] = [f"перевод {i}", f"значение {i}"]
+        payloads.append(json.dumps(data, ensure_ascii=False))
+    return payloads
+
+
+def measure(label, build, payloads):
+    """Байт на запись, занятых после построения всех записей"""
+    gc.collect()
+    tracemalloc.start()
+    records = [build(payload) for payload in payloads]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_entry = current / len(records)
+    print(f"{label:<28} {per_entry:10.0f} байт на запись, {current / 2 ** 20:8.1f} МБ всего")
+    return per_entry
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замер памяти модели результата")
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--senses", type=int, default=12, help="значений в одной записи")
+    args = parser.parse_args(argv)
+
+    payloads = make_payloads(args.entries, args.senses)
+    print(f"Записей: {args.entries}, значений в записи: {args.senses}")
+
+    as_dict = measure("dict (прежний формат)", json.loads, payloads)
+    as_model = measure("LookupResult", lambda payload: LookupResult.from_dict(json.loads(payload)), payloads)
+    print(f"Экономия: {(1 - as_model / as_dict) * 100:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
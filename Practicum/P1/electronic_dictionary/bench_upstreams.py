@@ -0,0 +1,354 @@
+"""Замер поиска без сети: локальные заглушки dictionaryapi.dev и Яндекс.Словаря.
+
+Заглушки отвечают записанными ответами из bench_fixtures.json, задержка и доля
+ошибок настраиваются. Поиск идет через настоящий DictionaryEngine (транспорт,
+повторы, автомат отключения), кэш и офлайн-индекс не используются.
+
+Примеры:
+    python bench_upstreams.py --requests 500 --concurrency 8 --latency 20 --jitter 10
+    python bench_upstreams.py --error-rate 0.05 --fail-p99 200
+    python bench_upstreams.py --slow-rate 0.03 --slow-latency 300 --hedge   # редкие выбросы, hedging
+    python bench_upstreams.py --record hello world --yandex-key KEY   # дописать фикстуры из живых API
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote, quote, urlencode
+
+from dictionary_engine import DictionaryEngine
+from lookup_cache import LookupCache
+from offline_index import SECTION_ENGLISH, SECTION_EN_RU, SECTION_RU_EN
+from result_model import LookupResult
+import response_parsers
+
+# Записанные ответы лежат рядом со скриптом
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_fixtures.json")
+
+ENGLISH_PATH = "/api/v2/entries/en/"
+YANDEX_PATH = "/api/v1/dicservice.json/lookup"
+
+# Ответ dictionaryapi.dev для неизвестного слова
+ENGLISH_NOT_FOUND = {
+    "title": "No Definitions Found",
+    "message": "Sorry pal, we couldn't find definitions for the word you were looking for.",
+    "resolution": "You can try the search again at later time or head to the web instead."
+}
+
+
+def load_fixtures(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def percentile(ordered, q):
+    """Перцентиль по отсортированному списку (ближайший ранг)"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class StubServer(ThreadingHTTPServer):
+    """HTTP-сервер заглушки: клиенты, не дождавшиеся ответа, - не ошибка"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Отмененные по дедлайну и проигравшие hedging запросы закрывают соединение раньше ответа
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class StubUpstream(ABC):
+    """Локальный HTTP-сервер с записанными ответами, задержкой и ошибками"""
+
+    def __init__(self, responses, latency=0.0, jitter=0.0, error_rate=0.0, slow_rate=0.0, slow_latency=0.0,
+                 seed=None):
+        self.responses = responses
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        # Доля ответов с дополнительной задержкой slow_latency (хвост распределения)
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+        handler = type("BoundStubHandler", (StubRequestHandler,), {"stub": self})
+        self.server = StubServer(("127.0.0.1", 0), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def inject(self):
+        """Задержка ответа и решение, отвечать ли ошибкой"""
+        with self.lock:
+            self.requests += 1
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            if self.random.random() < self.slow_rate:
+                delay += self.slow_latency
+            failed = self.random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        if delay > 0:
+            time.sleep(delay)
+        return failed
+
+    @abstractmethod
+    def resolve(self, path, query):
+        """(статус, тело ответа) для запроса"""
+
+
+class EnglishStub(StubUpstream):
+    """Заглушка dictionaryapi.dev: GET /api/v2/entries/en/<слово>"""
+
+    def resolve(self, path, query):
+        if not path.startswith(ENGLISH_PATH):
+            return 404, ENGLISH_NOT_FOUND
+        data = self.responses.get(SECTION_ENGLISH, {}).get(unquote(path[len(ENGLISH_PATH):]).lower())
+        return (200, data) if data is not None else (404, ENGLISH_NOT_FOUND)
+
+
+class YandexStub(StubUpstream):
+    """Заглушка Яндекс.Словаря: GET /api/v1/dicservice.json/lookup?lang=..&text=.."""
+
+    def resolve(self, path, query):
+        if path != YANDEX_PATH:
+            return 404, {"code": 404, "message": "Not found"}
+        lang = query.get("lang", [""])[0]
+        text = query.get("text", [""])[0].strip().lower()
+        data = self.responses.get(lang, {}).get(text)
+        return 200, data if data is not None else {"head": {}, "def": []}
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    """Обработчик запросов заглушки (keep-alive, как у настоящих API)"""
+
+    stub = None
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело пишутся отдельно: с алгоритмом Нейгла каждый ответ в
+    # keep-alive соединении ждал бы задержанного ACK клиента (~40 мс)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if self.stub.inject():
+            status, payload = 503, {"error": "injected"}
+        else:
+            status, payload = self.stub.resolve(url.path, parse_qs(url.query))
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Report:
+    """Задержки одного сценария"""
+
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.errors = 0
+        self.partial = 0
+        self.elapsed = 0.0
+
+    def summary(self):
+        ordered = sorted(self.latencies)
+        return {
+            "name": self.name,
+            "count": len(ordered),
+            "errors": self.errors,
+            "partial": self.partial,
+            "throughput": len(ordered) / self.elapsed if self.elapsed else 0.0,
+            "p50_ms": percentile(ordered, 0.5) * 1000,
+            "p95_ms": percentile(ordered, 0.95) * 1000,
+            "p99_ms": percentile(ordered, 0.99) * 1000
+        }
+
+
+def run_searches(name, search, words, count, concurrency):
+    """count вызовов search(word) по кругу из words в concurrency потоков"""
+    report = Report(name)
+    lock = threading.Lock()
+
+    def one(word):
+        start = time.perf_counter()
+        try:
+            result = search(word)
+            failed, partial = False, result.partial
+        except Exception:
+            failed, partial = True, False
+        latency = time.perf_counter() - start
+        with lock:
+            report.latencies.append(latency)
+            report.errors += failed
+            report.partial += partial
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench") as pool:
+        for i in range(count):
+            pool.submit(one, words[i % len(words)])
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def run_parser(name, parse, samples, repeat):
+    """Замер разбора каждого записанного ответа repeat раз"""
+    report = Report(name)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for word, data in samples:
+            start = time.perf_counter()
+            parse(data, word)
+            report.latencies.append(time.perf_counter() - start)
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def make_engine(english_url, yandex_url, concurrency, deadline, hedge=False):
+    """DictionaryEngine, направленный на заглушки"""
+    engine = DictionaryEngine(cache=LookupCache(db_path=":memory:"), upstream_workers=concurrency * 2, hedge=hedge)
+    engine.offline = None
+    engine.search_deadline = deadline
+    engine.free_dictionary_api = english_url + ENGLISH_PATH
+    engine.yandex_dictionary_api = yandex_url + YANDEX_PATH
+    return engine
+
+
+def record(words, path, yandex_key):
+    """Дописать в фикстуры ответы живых API для слов"""
+    fixtures = load_fixtures(path)
+    for word in words:
+        russian = re.search(r'[а-яА-ЯёЁ]', word) is not None
+        requests_to_make = []
+        if not russian:
+            requests_to_make.append((SECTION_ENGLISH, f"https://api.dictionaryapi.dev{ENGLISH_PATH}{quote(word.lower())}"))
+        if yandex_key:
+            lang = SECTION_RU_EN if russian else SECTION_EN_RU
+            params = urlencode({"key": yandex_key, "lang": lang, "text": word, "flags": 4})
+            requests_to_make.append((lang, f"https://dictionary.yandex.net{YANDEX_PATH}?{params}"))
+        for section, url in requests_to_make:
+            try:
+                with urllib.request.urlopen(url, timeout=10) as response:
+                    fixtures.setdefault(section, {})[word.lower()] = json.load(response)
+            except (urllib.error.URLError, ValueError) as e:
+                print(f"{section} {word}: {e}", file=sys.stderr)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixtures, f, ensure_ascii=False, indent=1)
+        f.write("\n")
+
+
+def print_report(summaries):
+    print(f"{'сценарий':<26} {'запросов':>9} {'ошибок':>7} {'неполн.':>8} {'в сек':>9} "
+          f"{'p50 мс':>9} {'p95 мс':>9} {'p99 мс':>9}")
+    for s in summaries:
+        print(f"{s['name']:<26} {s['count']:>9} {s['errors']:>7} {s['partial']:>8} {s['throughput']:>9.1f} "
+              f"{s['p50_ms']:>9.3f} {s['p95_ms']:>9.3f} {s['p99_ms']:>9.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замер поиска на локальных заглушках источников")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="файл записанных ответов")
+    parser.add_argument("--requests", type=int, default=300, help="поисков на сценарий")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=20.0, help="базовая задержка заглушек, мс")
+    parser.add_argument("--jitter", type=float, default=10.0, help="случайная добавка к задержке, мс")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="доля ответов 503")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="доля медленных ответов")
+    parser.add_argument("--slow-latency", type=float, default=0.0, help="дополнительная задержка медленных ответов, мс")
+    parser.add_argument("--hedge", action="store_true", help="включить hedging в транспорте")
+    parser.add_argument("--deadline", type=float, default=8.0, help="лимит времени одного поиска, с")
+    parser.add_argument("--parse-repeat", type=int, default=200, help="повторов замера разбора")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="отчет в JSON (для сравнения в CI)")
+    parser.add_argument("--fail-p99", type=float, metavar="MS",
+                        help="код выхода 1, если p99 любого сценария поиска больше MS")
+    parser.add_argument("--record", nargs="+", metavar="WORD", help="записать ответы живых API и выйти")
+    parser.add_argument("--yandex-key", help="ключ Яндекс.Словаря для --record")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record(args.record, args.fixtures, args.yandex_key)
+        return 0
+
+    fixtures = load_fixtures(args.fixtures)
+    options = dict(latency=args.latency / 1000, jitter=args.jitter / 1000, error_rate=args.error_rate,
+                   slow_rate=args.slow_rate, slow_latency=args.slow_latency / 1000)
+    english_stub = EnglishStub(fixtures, seed=args.seed, **options).start()
+    yandex_stub = YandexStub(fixtures, seed=args.seed + 1, **options).start()
+    engine = make_engine(english_stub.url, yandex_stub.url, args.concurrency, args.deadline, args.hedge)
+
+    english_words = sorted(fixtures.get(SECTION_ENGLISH, {}))
+    russian_words = sorted(fixtures.get(SECTION_RU_EN, {}))
+    try:
+        searches = [
+            run_searches("search_english_word", engine.search_english_word, english_words,
+                         args.requests, args.concurrency),
+            run_searches("search_russian_word", engine.search_russian_word, russian_words,
+                         args.requests, args.concurrency)
+        ]
+    finally:
+        engine.transport.close()
+        english_stub.stop()
+        yandex_stub.stop()
+
+    parsers = [
+        run_parser("parse_english_response",
+                   lambda data, word: response_parsers.parse_english_response(data, word, LookupResult(word, 'en')),
+                   list(fixtures.get(SECTION_ENGLISH, {}).items()), args.parse_repeat),
+        run_parser("parse_russian_response",
+                   lambda data, word: response_parsers.parse_russian_response(data, word, LookupResult(word, 'ru')),
+                   list(fixtures.get(SECTION_RU_EN, {}).items()), args.parse_repeat),
+        run_parser("extract_russian_translations",
+                   lambda data, word: response_parsers.extract_russian_translations(data),
+                   list(fixtures.get(SECTION_EN_RU, {}).items()), args.parse_repeat)
+    ]
+
+    summaries = [report.summary() for report in searches + parsers]
+    if args.json:
+        print(json.dumps({"stubs": {"english": english_stub.requests, "yandex": yandex_stub.requests,
+                                    "injected_errors": english_stub.errors + yandex_stub.errors},
+                          "results": summaries}, ensure_ascii=False, indent=1))
+    else:
+        print(f"Заглушки: {english_stub.requests + yandex_stub.requests} запросов, "
+              f"{english_stub.errors + yandex_stub.errors} внедренных ошибок")
+        print_report(summaries)
+
+    if args.fail_p99 is not None:
+        slow = [s["name"] for s in summaries[:len(searches)] if s["p99_ms"] > args.fail_p99]
+        if slow:
+            print(f"p99 больше {args.fail_p99} мс: {', '.join(slow)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
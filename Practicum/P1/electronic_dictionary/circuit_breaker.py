@@ -0,0 +1,98 @@
+import time
+import threading
+from collections import deque
+
+import requests
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Источник временно отключен автоматом после серии ошибок"""
+
+
+class CircuitBreaker:
+    """Автомат отключения источника.
+
+    closed    - запросы идут как обычно, ошибки подряд считаются;
+    open      - после failure_threshold ошибок запросы сразу отклоняются на cooldown секунд;
+    half_open - после паузы пропускается probes пробных запросов: успех закрывает
+                автомат, ошибка снова открывает его.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, cooldown=30.0, probes=1):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.probes = probes
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Можно ли сейчас отправить запрос"""
+        with self.lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    return False
+                self.state = self.HALF_OPEN
+                self.probes_in_flight = 0
+            if self.state == self.HALF_OPEN:
+                if self.probes_in_flight >= self.probes:
+                    return False
+                self.probes_in_flight += 1
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.probes_in_flight = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.probes_in_flight = 0
+
+
+class LatencyTracker:
+    """Скользящее окно задержек источника для адаптивного таймаута и hedging"""
+
+    def __init__(self, window=200, min_samples=20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, q):
+        """Перцентиль задержки или None, пока наблюдений мало"""
+        with self.lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def hedge_delay(self, q=0.95, multiplier=2.0):
+        """Когда отправлять второй запрос: p95, но не позже multiplier * p50
+        (если выбросов в окне больше 5%, p95 сам оказывается среди них)"""
+        with self.lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            ordered = sorted(self.samples)
+        return min(ordered[min(len(ordered) - 1, int(q * len(ordered)))], multiplier * ordered[len(ordered) // 2])
+
+    def adaptive_timeout(self, default, multiplier=3.0, minimum=1.0, q=0.99):
+        """Таймаут: multiplier * p99, но в пределах [minimum, default]"""
+        p = self.percentile(q)
+        if p is None:
+            return default
+        return max(minimum, min(default, p * multiplier))
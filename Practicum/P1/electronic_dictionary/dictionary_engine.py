@@ -0,0 +1,348 @@
+import re
+import copy
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+import requests
+
+from lookup_cache import LookupCache
+from dictionary_transport import DictionaryTransport
+from circuit_breaker import CircuitOpenError
+from spelling import SpellingIndex
+from offline_index import OfflineIndex, SECTION_ENGLISH, SECTION_EN_RU, SECTION_RU_EN
+from instrumentation import METRICS
+from result_model import LookupResult
+import response_parsers
+
+# Имена источников в метриках
+ENGLISH_UPSTREAM = "api.dictionaryapi.dev"
+YANDEX_UPSTREAM = "dictionary.yandex.net"
+OFFLINE_UPSTREAM = "offline"
+
+
+class DictionaryEngine:
+    """Логика поиска без интерфейса: источники, кэш и разбор ответов"""
+
+    def __init__(self, cache=None, rate_limits=None, upstream_workers=8, offline=None, hedge=False):
+        # API ключи (замените на свои)
+        self.yandex_api_key = "YOUR_API_KEY_HERE"
+        self.free_dictionary_api = "https://api.dictionaryapi.dev/api/v2/entries/en/"
+        self.yandex_dictionary_api = "https://dictionary.yandex.net/api/v1/dicservice.json/lookup"
+        
+        # Общий лимит времени на один поиск (секунды) и пул для параллельных запросов
+        self.search_deadline = 8
+        # Сколько ждать перевод после ответа словаря, если его можно дослать через on_refresh
+        self.secondary_wait = 0.3
+        self.executor = ThreadPoolExecutor(max_workers=upstream_workers, thread_name_prefix="upstream")
+        
+        # Keep-alive соединения с повторами, отдельный пул на каждый хост
+        self.transport = DictionaryTransport(
+            pool_sizes={'api.dictionaryapi.dev': upstream_workers, 'dictionary.yandex.net': upstream_workers},
+            rate_limits=rate_limits,
+            max_retries=2,
+            timeout=self.search_deadline,
+            failure_threshold=5,  # после 5 отказов подряд источник пропускается
+            cooldown=30.0,        # на 30 секунд, затем пробный запрос
+            hedge=hedge           # второй запрос при медленном ответе (см. UpstreamTransport)
+        )
+        
+        # Кэш результатов поиска (память + диск)
+        self.cache = LookupCache() if cache is None else cache
+        # Срок хранения результата без части от отключенного автоматом источника (секунды)
+        self.unavailable_ttl = 60
+        
+        # Офлайн-индекс (если собран); сеть используется только для отсутствующих в нем слов
+        self.offline = OfflineIndex.open_default() if offline is None else offline
+        
+        # Фоновое обновление устаревших записей кэша (stale-while-revalidate)
+        self.refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="refresh")
+        self.refreshing = set()
+        self.refresh_lock = threading.Lock()
+        
+        # Исправление опечаток по известным словам (заполняется load_word_indexes)
+        self.spelling = SpellingIndex()
+    
+    def detect_language(self, word):
+        """Определение языка слова"""
+        if re.search(r'[а-яА-ЯёЁ]', word):
+            return 'ru'
+        elif re.search(r'[a-zA-Z]', word):
+            return 'en'
+        return None
+    
+    def known_words(self):
+        """Все известные заголовочные слова: кэш и офлайн-индекс"""
+        words = self.cache.words()
+        if self.offline is not None:
+            for section in (SECTION_ENGLISH, SECTION_EN_RU, SECTION_RU_EN):
+                words.extend(self.offline.words(section))
+        return words
+    
+    def lookup_word(self, word, language, on_refresh=None):
+        """Поиск слова с учетом кэша.
+        
+        Если передан on_refresh, устаревшая запись кэша возвращается сразу,
+        а свежие данные запрашиваются в фоне; on_refresh(word, language, result)
+        вызывается, только если содержимое действительно изменилось.
+        """
+        if on_refresh is None:
+            result = self.cache.get(language, word)
+            if result is not None:
+                return result
+        else:
+            result, stale = self.cache.get_stale(language, word)
+            if result is not None:
+                if stale:
+                    self.revalidate(word, language, result, on_refresh)
+                return result
+        
+        return self.fetch_word(word, language, on_refresh)
+    
+    def fetch_word(self, word, language, on_refresh=None):
+        """Поиск слова в источниках с сохранением в кэш"""
+        if language == 'en':
+            result = self.search_english_word(word, on_refresh)
+        else:
+            result = self.search_russian_word(word)
+        
+        found = result.found()
+        
+        # Пустые и неполные результаты не кэшируем - это может быть временный сбой сети.
+        # Без части от отключенного источника результат хранится недолго: источник известен
+        # как недоступный, и каждый поиск без кэша снова упирался бы в автомат
+        if found and not result.partial:
+            self.cache.put(language, word, result, ttl=self.unavailable_ttl if result.missing else None)
+        
+        if found:
+            self.spelling.add(word)
+        elif 'translation' not in result.missing:
+            # Основной источник ответил, что слова нет - предлагаем похожие известные слова
+            result.suggestions = tuple(self.spelling.suggest(word))
+        
+        return result
+    
+    def revalidate(self, word, language, stale_result, on_refresh):
+        """Фоновое обновление устаревшей записи (не больше одного на слово)"""
+        key = self.cache.make_key(language, word)
+        with self.refresh_lock:
+            if key in self.refreshing:
+                return
+            self.refreshing.add(key)
+        
+        def refresh():
+            try:
+                if language == 'en':
+                    fresh = self.search_english_word(word)
+                else:
+                    fresh = self.search_russian_word(word)
+                
+                # Неполный или пустой ответ не заменяет то, что уже есть
+                if fresh.missing or not fresh.found():
+                    return
+                if fresh.same_content(stale_result):
+                    self.cache.touch(language, word)
+                else:
+                    self.cache.put(language, word, fresh)
+                    on_refresh(word, language, fresh)
+            except Exception:
+                pass  # Остается устаревшая запись, следующая попытка - при следующем поиске
+            finally:
+                with self.refresh_lock:
+                    self.refreshing.discard(key)
+        
+        self.refresh_executor.submit(refresh)
+    
+    def search_english_word(self, word, on_refresh=None):
+        """Поиск английского слова с переводом на русский.
+        
+        Если передан on_refresh, определения возвращаются, не дожидаясь медленного
+        перевода: он дописывается позже и приходит через on_refresh(word, language, result).
+        """
+        result = LookupResult(word, 'en')
+        missing = []
+        # Части от источников, отключенных автоматом, - их отсутствие не временный сбой
+        unavailable = []
+        
+        # Сначала офлайн-индекс
+        english_data = self.offline_lookup(SECTION_ENGLISH, word)
+        russian_data = self.offline_lookup(SECTION_EN_RU, word)
+        if english_data is not None:
+            with METRICS.span("parse", OFFLINE_UPSTREAM):
+                result = self.parse_english_response(english_data, word, result)
+        if russian_data is not None:
+            with METRICS.span("parse", OFFLINE_UPSTREAM):
+                result.russian_translation = self.extract_russian_translations(russian_data)
+        if english_data is not None and russian_data is not None:
+            return result
+        
+        # Недостающие источники опрашиваем одновременно под общим дедлайном
+        deadline = time.monotonic() + self.search_deadline
+        english_future = None
+        russian_future = None
+        if english_data is None:
+            english_future = self.executor.submit(self.fetch_english_entry, word, deadline)
+        if russian_data is None:
+            russian_future = self.executor.submit(self.get_russian_translation, word, deadline)
+        
+        # 1. Информация об английском слове
+        if english_future is not None:
+            try:
+                data = english_future.result(timeout=max(0, deadline - time.monotonic()))
+                if data is not None:
+                    with METRICS.span("parse", ENGLISH_UPSTREAM):
+                        result = self.parse_english_response(data, word, result)
+            except FutureTimeout:
+                METRICS.count_error(ENGLISH_UPSTREAM, "deadline")
+                missing.append('translation')
+            except CircuitOpenError:
+                missing.append('translation')
+                unavailable.append('translation')
+            except Exception:
+                # Источник ответил ошибкой (ошибка уже учтена транспортом) - это не "слово не найдено"
+                missing.append('translation')
+        
+        # 2. Перевод на русский через Яндекс - ждем остаток дедлайна, а если определения
+        # уже есть и перевод можно дослать, то только secondary_wait
+        late_translation = False
+        if russian_future is not None:
+            remaining = max(0, deadline - time.monotonic())
+            wait = remaining
+            if on_refresh is not None and 'translation' not in missing:
+                wait = min(self.secondary_wait, remaining)
+            try:
+                result.russian_translation = russian_future.result(timeout=wait)
+            except FutureTimeout:
+                if wait < remaining:
+                    late_translation = True
+                else:
+                    METRICS.count_error(YANDEX_UPSTREAM, "deadline")
+                missing.append('russian_translation')
+            except CircuitOpenError:
+                missing.append('russian_translation')
+                unavailable.append('russian_translation')
+            except Exception:
+                missing.append('russian_translation')
+        
+        # partial - не хватает ответа, который мог прийти (таймаут или ошибка): такой результат
+        # не кэшируется; missing - все недостающие части, включая отключенные источники
+        result.missing = tuple(missing)
+        result.partial = len(missing) > len(unavailable)
+        
+        if late_translation:
+            russian_future.add_done_callback(
+                lambda future: self.deliver_late_translation(result, future, on_refresh))
+        return result
+    
+    def deliver_late_translation(self, result, future, on_refresh):
+        """Полный результат, когда перевод пришел после возврата определений"""
+        try:
+            translation = future.result()
+        except Exception:
+            return  # Перевод так и не пришел - на экране остается неполный результат
+        
+        # Возвращенный результат уже у вызывающего, поэтому дополняется копия
+        fresh = copy.copy(result)
+        fresh.russian_translation = translation
+        # Короткое ожидание бывает, только когда часть словаря на месте, - перевод был последней
+        fresh.missing = ()
+        fresh.partial = False
+        fresh.suggestions = ()
+        if not fresh.found():
+            return
+        
+        self.cache.put('en', result.original_word, fresh)
+        self.spelling.add(result.original_word)
+        try:
+            on_refresh(result.original_word, 'en', fresh)
+        except Exception:
+            pass  # Ошибка получателя не должна ломать поток источника
+    
+    def offline_lookup(self, section, word):
+        """Ответ из офлайн-индекса или None"""
+        if self.offline is None:
+            return None
+        with METRICS.span("lookup", OFFLINE_UPSTREAM):
+            return self.offline.get(section, word)
+    
+    def fetch_english_entry(self, word, deadline=None):
+        """Запрос к dictionaryapi.dev, возвращает JSON или None, если слова нет.
+        
+        Остальные ошибочные ответы выбрасывают requests.HTTPError.
+        """
+        url = f"{self.free_dictionary_api}{word.lower()}"
+        response = self.transport.get(url, deadline=deadline)
+        
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        with METRICS.span("json", ENGLISH_UPSTREAM):
+            return response_parsers.loads(response.content)
+    
+    def search_russian_word(self, word):
+        """Поиск русского слова с переводом на английский"""
+        result = LookupResult(word.upper(), 'ru')
+        
+        # Офлайн-индекс отвечает без сети
+        data = self.offline_lookup(SECTION_RU_EN, word)
+        if data is not None:
+            with METRICS.span("parse", OFFLINE_UPSTREAM):
+                return self.parse_russian_response(data, word, result)
+        
+        # Получаем информацию через Яндекс API
+        try:
+            params = {
+                "key": self.yandex_api_key,
+                "lang": "ru-en",  # Русско-английский перевод
+                "text": word,
+                "flags": 4
+            }
+            
+            deadline = time.monotonic() + self.search_deadline
+            response = self.transport.get(self.yandex_dictionary_api, params=params, deadline=deadline)
+            response.raise_for_status()
+            
+            with METRICS.span("json", YANDEX_UPSTREAM):
+                data = response_parsers.loads(response.content)
+            with METRICS.span("parse", YANDEX_UPSTREAM):
+                result = self.parse_russian_response(data, word, result)
+        except CircuitOpenError:
+            # Источник отключен автоматом - как и для английских слов, это недоступная часть, а не ошибка
+            result.missing = ('translation',)
+        except (requests.RequestException, ValueError) as e:
+            raise Exception(f"Ошибка при поиске русского слова: {str(e)}")
+        
+        return result
+    
+    def get_russian_translation(self, english_word, deadline=None):
+        """Получение перевода английского слова на русский.
+        
+        Пустой кортеж - Яндекс не знает слова; ошибка источника (в том числе
+        отключенного автоматом) выбрасывается - это неполный результат, а не пустой перевод.
+        """
+        params = {
+            "key": self.yandex_api_key,
+            "lang": "en-ru",  # Англо-русский перевод
+            "text": english_word,
+            "flags": 4
+        }
+        
+        response = self.transport.get(self.yandex_dictionary_api, params=params, deadline=deadline)
+        response.raise_for_status()
+        
+        with METRICS.span("json", YANDEX_UPSTREAM):
+            data = response_parsers.loads(response.content)
+        with METRICS.span("parse", YANDEX_UPSTREAM):
+            return self.extract_russian_translations(data)
+    
+    def extract_russian_translations(self, data):
+        """Список переводов из ответа Яндекса"""
+        return response_parsers.extract_russian_translations(data)
+    
+    def parse_english_response(self, data, word, result):
+        """Парсинг ответа от английского API"""
+        return response_parsers.parse_english_response(data, word, result)
+    
+    def parse_russian_response(self, data, word, result):
+        """Парсинг ответа от Яндекс.Словаря"""
+        return response_parsers.parse_russian_response(data, word, result)
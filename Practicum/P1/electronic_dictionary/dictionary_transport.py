@@ -0,0 +1,384 @@
+import time
+import random
+import threading
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from instrumentation import METRICS
+from circuit_breaker import CircuitBreaker, CircuitOpenError, LatencyTracker
+
+# Ответы, после которых имеет смысл повторить запрос
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Ответы, которые считаются отказом источника для автомата отключения
+# (401/403 - например, отклоненный ключ API)
+BREAKER_FAILURE_STATUSES = RETRY_STATUSES | {401, 403}
+
+
+def parse_retry_after(value):
+    """Значение заголовка Retry-After в секундах (число или HTTP-дата)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+def host_label(host, port, default_port):
+    """Имя источника в метриках: хост, а порт - только если он не стандартный
+    (одинаково для всех фаз запроса и для выбора транспорта)"""
+    if port is None or port == default_port:
+        return host
+    return f"{host}:{port}"
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """Соединение, которое замеряет время установки (TCP)"""
+
+    def connect(self):
+        with METRICS.span("connect", host_label(self.host, self.port, self.default_port)):
+            super().connect()
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    """Соединение, которое замеряет время установки (TCP + TLS)"""
+
+    def connect(self):
+        with METRICS.span("connect", host_label(self.host, self.port, self.default_port)):
+            super().connect()
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Адаптер requests, пулы которого создают замеряемые соединения"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool
+        }
+
+
+class UpstreamResponse:
+    """Прочитанный ответ источника.
+
+    not_modified - сервер ответил 304, content - сохраненное ранее тело,
+    status_code - 200 (для вызывающего кода данные те же, что в прошлый раз).
+    """
+
+    __slots__ = ('url', 'status_code', 'headers', 'content', 'not_modified')
+
+    def __init__(self, url, status_code, headers, content, not_modified=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.not_modified = not_modified
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class RateLimiter:
+    """Ограничение частоты запросов (token bucket)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Блокирует поток, пока не появится свободный токен"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def try_acquire(self):
+        """Взять токен, если он есть сейчас (без ожидания)"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class UpstreamTransport:
+    """Пул keep-alive соединений с повторами, автоматом отключения
+    и адаптивным таймаутом для одного хоста"""
+
+    def __init__(self, host="", pool_size=8, max_retries=3, backoff_base=0.3, backoff_max=5.0, timeout=8,
+                 rate_limit=None, failure_threshold=5, cooldown=30.0, hedge=False, max_hedges=None,
+                 hedge_budget=0.1):
+        self.host = host
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.breaker = CircuitBreaker(failure_threshold=failure_threshold, cooldown=cooldown)
+        self.latency = LatencyTracker()
+        # Hedging: второй запрос уходит, если первый не ответил за p95. Одновременно идет
+        # не больше max_hedges вторых запросов, всего их не больше hedge_budget от всех запросов
+        self.hedge_executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="hedge") if hedge else None
+        self.max_hedges = max(1, pool_size // 4) if max_hedges is None else max_hedges
+        self.hedge_budget = hedge_budget
+        self.hedge_lock = threading.Lock()
+        self.hedges_in_flight = 0
+        self.hedges_sent = 0
+        self.requests_sent = 0
+
+        # Валидаторы для условных запросов: полный URL -> (ETag, Last-Modified, тело)
+        self.validators = OrderedDict()
+        self.validators_size = 512
+        self.validators_lock = threading.Lock()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        # Повторы делаем сами, поэтому у адаптера они отключены
+        self.session = requests.Session()
+        adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0, pool_block=False)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def backoff(self, attempt):
+        """Экспоненциальная задержка с полным джиттером"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def get(self, url, params=None, timeout=None, deadline=None):
+        """GET с повторами при сетевых ошибках, 429 и 5xx.
+
+        deadline - момент time.monotonic(), после которого повторы не делаются.
+        Retry-After соблюдается; если он больше backoff_max или выходит за дедлайн,
+        возвращается сам ответ 429/503.
+        Если автомат источника открыт, сразу выбрасывает CircuitOpenError.
+        """
+        timed_out = False
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            if not self.breaker.allow():
+                METRICS.count_error(self.host, "circuit_open")
+                raise CircuitOpenError(f"Источник {self.host} временно отключен")
+            probe = self.breaker.state == CircuitBreaker.HALF_OPEN
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            # Таймаут подстраивается под наблюдаемые задержки и не выходит за дедлайн.
+            # Пробный запрос и повтор после таймаута ждут полный таймаут: источник мог
+            # стать медленнее, и короткий адаптивный таймаут не дал бы это увидеть
+            request_timeout = self.timeout if timeout is None else timeout
+            if not (probe or timed_out):
+                request_timeout = self.latency.adaptive_timeout(request_timeout)
+            if deadline is not None:
+                request_timeout = max(0.1, min(request_timeout, deadline - time.monotonic()))
+
+            try:
+                response = self.hedged_fetch(url, params, request_timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                timed_out = isinstance(e, requests.Timeout)
+                self.breaker.record_failure()
+                METRICS.count_error(self.host, type(e).__name__)
+                if last_attempt:
+                    raise
+                delay = self.backoff(attempt)
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            else:
+                if response.status_code in BREAKER_FAILURE_STATUSES:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                if response.status_code >= 400:
+                    METRICS.count_error(self.host, f"http_{response.status_code}")
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is None:
+                    delay = self.backoff(attempt)
+                elif retry_after > self.backoff_max or (deadline is not None
+                                                        and time.monotonic() + retry_after >= deadline):
+                    # Сервер просит ждать дольше, чем мы можем: раньше срока не повторяем
+                    return response
+                else:
+                    delay = retry_after
+
+            # Не ждем дольше, чем позволяет общий дедлайн поиска
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise requests.Timeout(f"Дедлайн исчерпан после {attempt + 1} попыток: {url}")
+            time.sleep(delay)
+
+    def hedged_fetch(self, url, params, timeout):
+        """Запрос с hedging: если ответа нет дольше p95 (см. LatencyTracker.hedge_delay),
+        отправляется второй такой же запрос и берется тот, что ответит первым"""
+        hedge_delay = self.latency.hedge_delay() if self.hedge_executor is not None else None
+        if hedge_delay is None or hedge_delay >= timeout:
+            return self.fetch(url, params, timeout)
+
+        with self.hedge_lock:
+            self.requests_sent += 1
+        first = self.hedge_executor.submit(self.fetch, url, params, timeout)
+        done, _ = wait([first], timeout=hedge_delay)
+        if done or not self.start_hedge():
+            return first.result()
+
+        second = self.hedge_executor.submit(self.fetch, url, params, timeout)
+        second.add_done_callback(self.finish_hedge)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # Проигравший запрос сам дочитает ответ и вернет соединение в пул
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def start_hedge(self):
+        """Можно ли отправить второй запрос: лимит одновременных, бюджет и токен частоты"""
+        with self.hedge_lock:
+            if self.hedges_in_flight >= self.max_hedges:
+                return False
+            if self.hedges_sent >= self.hedge_budget * self.requests_sent:
+                return False
+            # Второй запрос - такой же запрос к хосту, лимит частоты действует и на него
+            if self.rate_limiter is not None and not self.rate_limiter.try_acquire():
+                return False
+            self.hedges_in_flight += 1
+            self.hedges_sent += 1
+            return True
+
+    def finish_hedge(self, future):
+        with self.hedge_lock:
+            self.hedges_in_flight -= 1
+
+    def fetch(self, url, params, timeout):
+        """Один запрос с замером времени до заголовков (ttfb) и загрузки тела (download).
+
+        ttfb включает установку соединения, если свободного в пуле не было.
+        Если для URL известны ETag/Last-Modified, запрос делается условным;
+        на 304 возвращается сохраненное тело с not_modified=True.
+        """
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        headers = {}
+        with self.validators_lock:
+            stored = self.validators.get(full_url)
+            if stored is not None:
+                self.validators.move_to_end(full_url)
+        if stored is not None:
+            etag, last_modified, _ = stored
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        start = time.perf_counter()
+        try:
+            response = self.session.get(full_url, headers=headers, timeout=timeout, stream=True)
+        except requests.Timeout:
+            # Без ответа задержка не меньше таймаута - иначе адаптивный таймаут не смог бы вырасти
+            self.latency.observe(timeout)
+            raise
+        headers_received = time.perf_counter()
+        METRICS.observe("ttfb", self.host, headers_received - start)
+        self.latency.observe(headers_received - start)
+        try:
+            content = response.content
+        finally:
+            response.close()
+        METRICS.observe("download", self.host, time.perf_counter() - headers_received)
+
+        if response.status_code == 304 and stored is not None:
+            # Данные не изменились - тело не передавалось по сети
+            return UpstreamResponse(full_url, 200, response.headers, stored[2], not_modified=True)
+        if response.status_code == 200:
+            self.remember_validators(full_url, response.headers, content)
+        return UpstreamResponse(full_url, response.status_code, response.headers, content)
+
+    def remember_validators(self, full_url, headers, content):
+        """Сохранение ETag/Last-Modified и тела ответа для следующих условных запросов"""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        with self.validators_lock:
+            self.validators[full_url] = (etag, last_modified, content)
+            self.validators.move_to_end(full_url)
+            while len(self.validators) > self.validators_size:
+                self.validators.popitem(last=False)
+
+    def close(self):
+        if self.hedge_executor is not None:
+            self.hedge_executor.shutdown(wait=False)
+        self.session.close()
+
+
+class DictionaryTransport:
+    """Транспортный слой словаря: отдельный пул соединений на каждый хост"""
+
+    def __init__(self, pool_sizes=None, default_pool_size=8, rate_limits=None, **options):
+        # pool_sizes: {'api.dictionaryapi.dev': 8, ...}
+        # rate_limits: {'dictionary.yandex.net': 5.0, ...} - запросов в секунду
+        self.pool_sizes = dict(pool_sizes or {})
+        self.rate_limits = dict(rate_limits or {})
+        self.default_pool_size = default_pool_size
+        self.options = options
+        self.upstreams = {}
+        self.lock = threading.Lock()
+
+    def for_host(self, host):
+        """Транспорт для хоста (создается при первом обращении)"""
+        with self.lock:
+            upstream = self.upstreams.get(host)
+            if upstream is None:
+                pool_size = self.pool_sizes.get(host, self.default_pool_size)
+                upstream = UpstreamTransport(host=host, pool_size=pool_size, rate_limit=self.rate_limits.get(host),
+                                             **self.options)
+                self.upstreams[host] = upstream
+            return upstream
+
+    def get(self, url, params=None, timeout=None, deadline=None):
+        parts = urlsplit(url)
+        host = host_label(parts.hostname, parts.port, 443 if parts.scheme == "https" else 80)
+        return self.for_host(host).get(url, params=params, timeout=timeout, deadline=deadline)
+
+    def close(self):
+        with self.lock:
+            for upstream in self.upstreams.values():
+                upstream.close()
+            self.upstreams.clear()
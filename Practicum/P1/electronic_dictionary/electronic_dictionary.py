@@ -1,26 +1,48 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-import requests
+from tkinter import ttk, messagebox, scrolledtext, filedialog
 import json
 from threading import Thread
-import re
 import pyperclip  
+from dictionary_engine import DictionaryEngine
+from prefix_index import PrefixIndex
+from lookup_scheduler import LookupScheduler
+from result_renderer import ResultRenderer
+from prefetcher import Prefetcher
+from instrumentation import METRICS
 
-class DictionaryApp:
+class DictionaryApp(DictionaryEngine):
     def __init__(self, root):
         self.root = root
         self.root.title("Электронный словарь")
         self.root.geometry("750x750")
         self.root.configure(bg="#f0f0f0")
         
-        # API ключи (замените на свои)
-        self.yandex_api_key = "YOUR_API_KEY_HERE"
-        self.free_dictionary_api = "https://api.dictionaryapi.dev/api/v2/entries/en/"
+        DictionaryEngine.__init__(self)
         
         # Переменные для хранения данных
         self.current_data = None
         
+        # Поиски идут через планировщик: не больше 4 потоков, устаревшие результаты отбрасываются.
+        # Устаревшая запись кэша показывается сразу и обновляется в фоне
+        self.scheduler = LookupScheduler(
+            lambda word, language: self.lookup_word(word, language, on_refresh=self.on_background_refresh),
+            max_workers=4
+        )
+        
+        # Прогрев кэша для синонимов и переводов, когда пользователь ничего не делает
+        self.prefetcher = Prefetcher(self, self.scheduler.pool)
+        self.prefetch_delay = 500  # мс
+        self.prefetch_job = None
+        
+        # Автодополнение: индекс заполняется в фоне, запросы откладываются до паузы в наборе
+        self.prefix_index = PrefixIndex()
+        self.suggest_delay = 150  # мс
+        self.suggest_limit = 8
+        self.suggest_job = None
+        
         self.setup_ui()
+        
+        Thread(target=self.load_word_indexes, daemon=True).start()
     
     def setup_ui(self):
         # Стили
@@ -83,6 +105,9 @@ class DictionaryApp:
         )
         self.word_entry.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.word_entry.bind('<Return>', lambda e: self.search_word())
+        self.word_entry.bind('<KeyRelease>', self.on_entry_key)
+        self.word_entry.bind('<Down>', self.focus_suggestions)
+        self.word_entry.bind('<Escape>', lambda e: self.hide_suggestions())
         
         # Фокус на поле ввода при запуске
         self.word_entry.focus_set()
@@ -162,6 +187,18 @@ class DictionaryApp:
         )
         self.translation_label.pack(side=tk.LEFT, padx=(20, 0))
         
+        self.diagnostics_btn = tk.Button(
+            self.word_info_frame,
+            text="Диагностика",
+            command=self.show_diagnostics,
+            font=("Arial", 9),
+            bg="#e0e0e0",
+            relief=tk.RAISED,
+            bd=1
+        )
+        self.diagnostics_btn.pack(side=tk.RIGHT)
+        self.diagnostics_window = None
+        
         # Раздел результатов
         result_frame = tk.LabelFrame(
             main_frame,
@@ -196,6 +233,11 @@ class DictionaryApp:
         self.result_text.tag_configure("translation", font=("Consolas", 11), foreground="#000000")
         self.result_text.tag_configure("synonyms", font=("Consolas", 10), foreground="#388E3C")
         self.result_text.tag_configure("example", font=("Consolas", 10, "italic"), foreground="#7B1FA2")
+        self.result_text.tag_configure("correction", font=("Consolas", 11, "underline"), foreground="#1565C0")
+        self.result_text.tag_bind("correction", "<Button-1>", self.on_correction_click)
+        self.result_text.tag_bind("correction", "<Enter>", lambda e: self.result_text.config(cursor="hand2"))
+        self.result_text.tag_bind("correction", "<Leave>", lambda e: self.result_text.config(cursor=""))
+        self.renderer = ResultRenderer(self.result_text)
         
         # Статус бар
         self.status_bar = tk.Label(
@@ -209,18 +251,83 @@ class DictionaryApp:
             font=("Arial", 9)
         )
         self.status_bar.pack(fill=tk.X, pady=(10, 0))
+        
+        # Выпадающий список подсказок (показывается под полем ввода)
+        self.entry_frame = entry_frame
+        self.suggestion_list = tk.Listbox(
+            main_frame,
+            font=("Arial", 12),
+            height=self.suggest_limit,
+            bd=1,
+            relief=tk.SOLID,
+            activestyle='none',
+            selectbackground="#4CAF50"
+        )
+        self.suggestion_list.bind('<Return>', self.apply_suggestion)
+        self.suggestion_list.bind('<ButtonRelease-1>', self.apply_suggestion)
+        self.suggestion_list.bind('<Escape>', lambda e: self.hide_suggestions(focus_entry=True))
+    
+    def load_word_indexes(self):
+        """Сбор известных слов для автодополнения и исправления опечаток (в фоновом потоке)"""
+        words = self.known_words()
+        self.prefix_index.update(words)
+        self.spelling.update(words)
+    
+    def on_entry_key(self, event):
+        """Отложенное обновление подсказок после нажатия клавиши"""
+        if event.keysym in ('Return', 'Escape', 'Down', 'Up'):
+            return
+        if self.suggest_job is not None:
+            self.root.after_cancel(self.suggest_job)
+        self.suggest_job = self.root.after(self.suggest_delay, self.update_suggestions)
     
-    def detect_language(self, word):
-        """Определение языка слова"""
-        if re.search(r'[а-яА-ЯёЁ]', word):
-            return 'ru'
-        elif re.search(r'[a-zA-Z]', word):
-            return 'en'
-        return None
+    def update_suggestions(self):
+        """Показ подсказок для текущего префикса"""
+        self.suggest_job = None
+        prefix = self.word_var.get()
+        suggestions = self.prefix_index.complete(prefix, self.suggest_limit)
+        if not suggestions or suggestions == [prefix.strip().lower()]:
+            self.hide_suggestions()
+            return
+        
+        self.suggestion_list.delete(0, tk.END)
+        self.suggestion_list.insert(tk.END, *suggestions)
+        self.suggestion_list.config(height=len(suggestions))
+        self.suggestion_list.place(in_=self.entry_frame, relx=0, rely=1, relwidth=1)
+        self.suggestion_list.lift()
+    
+    def focus_suggestions(self, event=None):
+        """Переход в список подсказок стрелкой вниз"""
+        if self.suggestion_list.winfo_ismapped():
+            self.suggestion_list.focus_set()
+            self.suggestion_list.selection_clear(0, tk.END)
+            self.suggestion_list.selection_set(0)
+            self.suggestion_list.activate(0)
+        return "break"
+    
+    def apply_suggestion(self, event=None):
+        """Выбор подсказки и запуск поиска"""
+        selection = self.suggestion_list.curselection()
+        if not selection:
+            return
+        self.word_var.set(self.suggestion_list.get(selection[0]))
+        self.hide_suggestions(focus_entry=True)
+        self.word_entry.icursor(tk.END)
+        self.search_word()
+    
+    def hide_suggestions(self, focus_entry=False):
+        """Скрыть список подсказок"""
+        if self.suggest_job is not None:
+            self.root.after_cancel(self.suggest_job)
+            self.suggest_job = None
+        self.suggestion_list.place_forget()
+        if focus_entry:
+            self.word_entry.focus_set()
     
     def search_word(self):
         """Поиск слова"""
         word = self.word_var.get().strip()
+        self.hide_suggestions()
         
         if not word:
             messagebox.showwarning("Внимание", "Пожалуйста, введите слово для поиска")
@@ -240,302 +347,97 @@ class DictionaryApp:
         self.search_btn.config(state=tk.DISABLED, text="Поиск...")
         self.status_bar.config(text=f"Идет поиск слова '{word}'...")
         
-        # Запускаем поиск в отдельном потоке
-        Thread(target=self.perform_search, args=(word, language), daemon=True).start()
-    
-    def perform_search(self, word, language):
-        """Выполнение поиска в API"""
-        try:
-            if language == 'en':
-                result = self.search_english_word(word)
-            else:
-                result = self.search_russian_word(word)
-            
-            # Сохраняем данные для копирования
-            self.current_data = result
-            
-            # Обновляем UI в основном потоке
-            self.root.after(0, self.display_results, result)
-            
-        except Exception as e:
-            self.root.after(0, self.show_error, str(e))
-    
-    def search_english_word(self, word):
-        """Поиск английского слова с переводом на русский"""
-        result = {
-            'original_word': word,
-            'language': 'en',
-            'translation': [],
-            'phonetics': '',
-            'part_of_speech': '',
-            'synonyms': [],
-            'examples': [],
-            'russian_translation': []
-        }
+        # Новый поиск важнее прогрева соседей предыдущего слова
+        self.cancel_prefetch()
         
-        # 1. Получаем информацию об английском слове
-        try:
-            url = f"{self.free_dictionary_api}{word.lower()}"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                result = self.parse_english_response(data, word, result)
-        except:
-            pass  # Пропускаем если английский API не доступен
-        
-        # 2. Получаем перевод на русский через Яндекс
-        try:
-            russian_trans = self.get_russian_translation(word)
-            result['russian_translation'] = russian_trans
-        except:
-            pass  # Пропускаем если Яндекс API не доступен
-        
-        return result
+        # Запускаем поиск в пуле планировщика; предыдущий поиск становится устаревшим
+        self.scheduler.submit(
+            word, language,
+            on_result=lambda token, result: self.root.after(0, self.deliver_result, token, result),
+            on_error=lambda token, message: self.root.after(0, self.deliver_error, token, message)
+        )
     
-    def search_russian_word(self, word):
-        """Поиск русского слова с переводом на английский"""
-        result = {
-            'original_word': word.upper(),
-            'language': 'ru',
-            'translation': [],
-            'phonetics': '',
-            'part_of_speech': '',
-            'synonyms': [],
-            'examples': []
-        }
+    def deliver_result(self, token, result):
+        """Показ результата, если за это время не начался новый поиск"""
+        if not self.scheduler.is_current(token):
+            return
+        
+        # Сохраняем данные для копирования
+        self.current_data = result
+        with METRICS.span("render", "ui"):
+            self.display_results(result)
         
-        # Получаем информацию через Яндекс API
-        try:
-            url = "https://dictionary.yandex.net/api/v1/dicservice.json/lookup"
-            params = {
-                "key": self.yandex_api_key,
-                "lang": "ru-en",  # Русско-английский перевод
-                "text": word,
-                "flags": 4
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            result = self.parse_russian_response(data, word, result)
-        except Exception as e:
-            raise Exception(f"Ошибка при поиске русского слова: {str(e)}")
-        
-        return result
+        # После паузы прогреваем кэш для слов, по которым вероятен следующий клик
+        if result.found():
+            self.prefetch_job = self.root.after(self.prefetch_delay, self.prefetcher.schedule, result)
     
-    def get_russian_translation(self, english_word):
-        """Получение перевода английского слова на русский"""
-        translations = []
-        
-        try:
-            url = "https://dictionary.yandex.net/api/v1/dicservice.json/lookup"
-            params = {
-                "key": self.yandex_api_key,
-                "lang": "en-ru",  # Англо-русский перевод
-                "text": english_word,
-                "flags": 4
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if 'def' in data and len(data['def']) > 0:
-                for definition in data['def']:
-                    for tr in definition.get('tr', []):
-                        translations.append(tr.get('text', ''))
-        
-        except:
-            pass
-        
-        return translations
+    def cancel_prefetch(self):
+        """Отмена запланированного и идущего прогрева"""
+        if self.prefetch_job is not None:
+            self.root.after_cancel(self.prefetch_job)
+            self.prefetch_job = None
+        self.prefetcher.cancel()
     
-    def parse_english_response(self, data, word, result):
-        """Парсинг ответа от английского API"""
-        if isinstance(data, list) and len(data) > 0:
-            entry = data[0]
-            
-            # Фонетика
-            if 'phonetics' in entry and len(entry['phonetics']) > 0:
-                for ph in entry['phonetics']:
-                    if 'text' in ph and ph['text']:
-                        result['phonetics'] = ph['text']
-                        break
-            
-            # Значения и переводы
-            if 'meanings' in entry:
-                for meaning in entry['meanings']:
-                    result['part_of_speech'] = meaning.get('partOfSpeech', '')
-                    
-                    for definition in meaning.get('definitions', []):
-                        translation = {
-                            'meaning': definition.get('definition', ''),
-                            'synonyms': definition.get('synonyms', []),
-                            'example': definition.get('example', '')
-                        }
-                        result['translation'].append(translation)
-                        
-                        # Синонимы
-                        result['synonyms'].extend(definition.get('synonyms', []))
-                        
-                        # Примеры
-                        if definition.get('example'):
-                            result['examples'].append(definition['example'])
-                    
-                    # Общие синонимы
-                    result['synonyms'].extend(meaning.get('synonyms', []))
-            
-            # Убираем дубликаты
-            result['synonyms'] = list(set(result['synonyms']))
-        
-        return result
+    def on_background_refresh(self, word, language, result):
+        """Свежие данные для устаревшей записи (вызывается из фонового потока)"""
+        self.root.after(0, self.deliver_refresh, language, result)
     
-    def parse_russian_response(self, data, word, result):
-        """Парсинг ответа от Яндекс.Словаря"""
-        if 'def' in data and len(data['def']) > 0:
-            for definition in data['def']:
-                result['part_of_speech'] = definition.get('pos', 'noun')
-                
-                # Транскрипция
-                if 'ts' in definition:
-                    result['phonetics'] = definition['ts']
-                
-                # Переводы
-                for tr in definition.get('tr', []):
-                    translation_item = {
-                        'meaning': tr.get('text', ''),
-                        'synonyms': [],
-                        'example': ''
-                    }
-                    
-                    # Синонимы для этого перевода
-                    if 'syn' in tr:
-                        for syn in tr['syn']:
-                            translation_item['synonyms'].append(syn.get('text', ''))
-                            result['synonyms'].append(syn.get('text', ''))
-                    
-                    # Примеры
-                    if 'ex' in tr and len(tr['ex']) > 0:
-                        for ex in tr['ex']:
-                            if 'text' in ex:
-                                example_text = f"{ex['text']} - {ex.get('tr', [{}])[0].get('text', '')}"
-                                translation_item['example'] = example_text
-                                result['examples'].append(example_text)
-                                break
-                    
-                    result['translation'].append(translation_item)
-        
-        # Убираем дубликаты
-        result['synonyms'] = list(set(result['synonyms']))
-        
-        return result
+    def deliver_refresh(self, language, result):
+        """Перерисовка, если на экране все еще то же слово"""
+        current = self.current_data
+        if (current is None or current.language != language or
+                current.original_word.lower() != result.original_word.lower()):
+            return
+        self.current_data = result
+        with METRICS.span("render", "ui"):
+            self.display_results(result)
+        self.status_bar.config(text=self.status_bar.cget("text") + " | данные обновлены")
+    
+    def deliver_error(self, token, message):
+        """Показ ошибки только для актуального поиска"""
+        if self.scheduler.is_current(token):
+            self.show_error(message)
     
     def display_results(self, result):
         """Отображение результатов в текстовом поле"""
-        self.result_text.delete(1.0, tk.END)
-        
         # Обновляем информацию о языке
-        lang_text = "АНГЛИЙСКОЕ СЛОВО" if result['language'] == 'en' else "РУССКОЕ СЛОВО"
-        self.language_label.config(text=f"{lang_text}: {result['original_word']}")
+        lang_text = "АНГЛИЙСКОЕ СЛОВО" if result.language == 'en' else "РУССКОЕ СЛОВО"
+        self.language_label.config(text=f"{lang_text}: {result.original_word}")
         
         # Отображение перевода
-        if result['language'] == 'en' and result['russian_translation']:
-            trans_text = f"Перевод на русский: {', '.join(result['russian_translation'][:3])}"
+        if result.language == 'en' and result.russian_translation:
+            trans_text = f"Перевод на русский: {', '.join(result.russian_translation[:3])}"
             self.translation_label.config(text=trans_text)
-        elif result['language'] == 'ru' and result['translation']:
-            trans_text = f"Перевод на английский: {result['translation'][0]['meaning'] if result['translation'] else 'нет перевода'}"
+        elif result.language == 'ru' and result.translation:
+            trans_text = f"Перевод на английский: {result.translation[0].meaning if result.translation else 'нет перевода'}"
             self.translation_label.config(text=trans_text)
         else:
             self.translation_label.config(text="")
         
-        # Заголовок с названием слова
-        if result['language'] == 'ru':
-            self.result_text.insert(tk.END, f"РУССКОЕ СЛОВО: {result['original_word']}\n", "header")
-        else:
-            self.result_text.insert(tk.END, f"АНГЛИЙСКОЕ СЛОВО: {result['original_word'].capitalize()}\n", "header")
-        
-        self.result_text.insert(tk.END, "---\n\n", "divider")
-        
-        # Часть речи
-        if result['part_of_speech']:
-            pos_display = {
-                'noun': 'существительное',
-                'verb': 'глагол',
-                'adjective': 'прилагательное',
-                'adverb': 'наречие',
-                'pronoun': 'местоимение',
-                'preposition': 'предлог',
-                'conjunction': 'союз',
-                'interjection': 'междометие'
-            }
-            pos = result['part_of_speech']
-            pos_text = pos_display.get(pos, pos)
-            self.result_text.insert(tk.END, f"Часть речи: ", "pos")
-            self.result_text.insert(tk.END, f"{pos_text}\n\n", "translation")
-        
-        # Транскрипция (для английских слов)
-        if result['language'] == 'en' and result['phonetics']:
-            self.result_text.insert(tk.END, f"Транскрипция: ", "pos")
-            self.result_text.insert(tk.END, f"[{result['phonetics']}]\n\n", "translation")
-        
-        # Перевод на английский (для русских слов) - уже в заголовке
-        if result['language'] == 'ru' and result['translation']:
-            english_word = result['translation'][0]['meaning'] if result['translation'] else "n/a"
-            self.result_text.insert(tk.END, f"Слово на английском: ", "pos")
-            self.result_text.insert(tk.END, f"{english_word}\n\n", "translation")
-        
-        # Перевод на русский (для английских слов)
-        if result['language'] == 'en' and result['russian_translation']:
-            self.result_text.insert(tk.END, "Перевод на русский:\n", "pos")
-            for i, trans in enumerate(result['russian_translation'][:5], 1):
-                self.result_text.insert(tk.END, f"{i}. ", "translation_num")
-                self.result_text.insert(tk.END, f"{trans}\n", "translation")
-            self.result_text.insert(tk.END, "\n")
-        
-        # Определения/переводы
-        if result['translation']:
-            if result['language'] == 'en':
-                self.result_text.insert(tk.END, "Значения:\n", "pos")
-            else:
-                self.result_text.insert(tk.END, "Переводы:\n", "pos")
-            
-            for i, trans in enumerate(result['translation'][:5], 1):
-                self.result_text.insert(tk.END, f"{i}. ", "translation_num")
-                self.result_text.insert(tk.END, f"{trans['meaning']}\n", "translation")
-                
-                # Синонимы для данного перевода
-                if trans.get('synonyms'):
-                    synonyms_text = ", ".join(trans['synonyms'][:3])
-                    self.result_text.insert(tk.END, "   ", "synonyms")
-                    self.result_text.insert(tk.END, f"Синонимы: {synonyms_text}\n", "synonyms")
-                
-                # Пример использования
-                if trans.get('example'):
-                    self.result_text.insert(tk.END, "   ", "example")
-                    self.result_text.insert(tk.END, f"Пример: {trans['example']}\n", "example")
-                
-                self.result_text.insert(tk.END, "\n")
-        
-        # Общие синонимы, если есть
-        if result['synonyms'] and len(result['synonyms']) > 0:
-            self.result_text.insert(tk.END, "Синонимы:\n", "pos")
-            synonyms_list = ", ".join(result['synonyms'][:10])
-            self.result_text.insert(tk.END, f"{synonyms_list}\n\n", "synonyms")
-        
-        # Примеры использования
-        if result['examples'] and len(result['examples']) > 0:
-            self.result_text.insert(tk.END, "Примеры использования:\n", "pos")
-            for i, example in enumerate(result['examples'][:3], 1):
-                self.result_text.insert(tk.END, f"{i}. ", "example")
-                self.result_text.insert(tk.END, f"{example}\n", "example")
+        # Текст результата строится списком сегментов и вставляется за один проход
+        self.renderer.render(result)
         
         # Обновление статуса
         self.search_btn.config(state=tk.NORMAL, text="Поиск")
-        trans_count = len(result['translation']) + len(result.get('russian_translation', []))
-        self.status_bar.config(text=f"Найдено {trans_count} переводов/значений")
+        trans_count = len(result.translation) + len(result.russian_translation)
+        if trans_count:
+            # Найденное слово становится доступно для автодополнения
+            self.prefix_index.add(result.original_word)
+        status = f"Найдено {trans_count} переводов/значений"
+        if result.suggestions:
+            status = f"Слово не найдено, есть {len(result.suggestions)} похожих"
+        if result.missing:
+            status += " (неполный результат: источник не ответил)"
+        self.status_bar.config(text=f"{status} | {self.cache.stats_text()}")
+    
+    def on_correction_click(self, event):
+        """Поиск по выбранному исправлению"""
+        index = self.result_text.index(f"@{event.x},{event.y}")
+        word_range = self.result_text.tag_prevrange("correction", f"{index}+1c")
+        if not word_range:
+            return
+        self.word_var.set(self.result_text.get(*word_range))
+        self.search_word()
     
     def clear_all(self):
         """Очистить все поля"""
@@ -544,10 +446,70 @@ class DictionaryApp:
         self.language_label.config(text="")
         self.translation_label.config(text="")
         self.lang_indicator.config(text="")
+        self.scheduler.cancel()
+        self.cancel_prefetch()
+        self.search_btn.config(state=tk.NORMAL, text="Поиск")
         self.current_data = None
         self.status_bar.config(text="Поля очищены. Введите новое слово")
         self.word_entry.focus_set()
     
+    def show_diagnostics(self):
+        """Окно с задержками и ошибками по источникам"""
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.lift()
+            return
+        
+        window = tk.Toplevel(self.root)
+        window.title("Диагностика поиска")
+        window.geometry("700x420")
+        window.configure(bg="#f0f0f0")
+        self.diagnostics_window = window
+        
+        columns = ("upstream", "phase", "count", "avg", "p50", "p95", "p99")
+        headings = ("Источник", "Фаза", "Кол-во", "Среднее, мс", "p50, мс", "p95, мс", "p99, мс")
+        latency_tree = ttk.Treeview(window, columns=columns, show="headings", height=10)
+        for column, heading in zip(columns, headings):
+            latency_tree.heading(column, text=heading)
+            latency_tree.column(column, width=150 if column == "upstream" else 80, anchor=tk.CENTER)
+        latency_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        
+        errors_label = tk.Label(window, text="", font=("Consolas", 10), bg="#f0f0f0",
+                                fg="#D32F2F", justify=tk.LEFT, anchor=tk.W)
+        errors_label.pack(fill=tk.X, padx=10)
+        
+        buttons = tk.Frame(window, bg="#f0f0f0")
+        buttons.pack(fill=tk.X, padx=10, pady=10)
+        tk.Button(buttons, text="Экспорт (Prometheus)...", command=self.export_metrics).pack(side=tk.RIGHT)
+        tk.Button(buttons, text="Сбросить", command=METRICS.reset).pack(side=tk.RIGHT, padx=5)
+        
+        def refresh():
+            if not window.winfo_exists():
+                return
+            rows, errors = METRICS.snapshot()
+            latency_tree.delete(*latency_tree.get_children())
+            for upstream, phase, count, average, p50, p95, p99 in rows:
+                latency_tree.insert("", tk.END, values=(
+                    upstream, phase, count,
+                    *(f"{value * 1000:.1f}" if value != float("inf") else ">10000" for value in (average, p50, p95, p99))
+                ))
+            errors_text = "\n".join(f"{upstream}: {kind} × {count}" for (upstream, kind), count in errors)
+            errors_label.config(text=f"Ошибки:\n{errors_text}" if errors else "Ошибок нет")
+            window.after(1000, refresh)
+        
+        refresh()
+    
+    def export_metrics(self):
+        """Сохранение метрик в текстовый файл Prometheus"""
+        path = filedialog.asksaveasfilename(
+            parent=self.diagnostics_window,
+            defaultextension=".prom",
+            initialfile="dictionary_metrics.prom",
+            filetypes=[("Prometheus", "*.prom"), ("Все файлы", "*.*")]
+        )
+        if path:
+            METRICS.export(path)
+            self.status_bar.config(text=f"Метрики сохранены: {path}")
+    
     def copy_to_clipboard(self):
         """Копировать результаты в буфер обмена"""
         if self.current_data:
@@ -0,0 +1,116 @@
+import time
+import threading
+from contextlib import contextmanager
+
+# Границы корзин гистограмм задержек (секунды)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Гистограмма задержек с фиксированными корзинами"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.total += seconds
+        self.count += 1
+
+    def percentile(self, q):
+        """Оценка перцентиля по верхней границе корзины"""
+        if not self.count:
+            return 0.0
+        threshold = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= threshold:
+                return bound
+        return float("inf")
+
+
+class Metrics:
+    """Задержки по фазам и счетчики ошибок для каждого источника"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}  # (фаза, источник) -> Histogram
+        self.errors = {}      # (источник, вид ошибки) -> число
+
+    def observe(self, phase, upstream, seconds):
+        with self.lock:
+            histogram = self.histograms.get((phase, upstream))
+            if histogram is None:
+                histogram = self.histograms[(phase, upstream)] = Histogram()
+            histogram.observe(seconds)
+
+    def count_error(self, upstream, kind):
+        with self.lock:
+            self.errors[(upstream, kind)] = self.errors.get((upstream, kind), 0) + 1
+
+    @contextmanager
+    def span(self, phase, upstream):
+        """Замер длительности блока; исключение учитывается как ошибка и пробрасывается дальше"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.count_error(upstream, type(e).__name__)
+            raise
+        finally:
+            self.observe(phase, upstream, time.perf_counter() - start)
+
+    def snapshot(self):
+        """Строки для панели диагностики: (источник, фаза, число, среднее, p50, p95, p99)"""
+        with self.lock:
+            rows = []
+            for (phase, upstream), histogram in sorted(self.histograms.items(), key=lambda item: item[0][::-1]):
+                average = histogram.total / histogram.count if histogram.count else 0.0
+                rows.append((upstream, phase, histogram.count, average,
+                             histogram.percentile(0.5), histogram.percentile(0.95), histogram.percentile(0.99)))
+            errors = sorted(self.errors.items())
+        return rows, errors
+
+    def to_prometheus(self):
+        """Текст в формате экспозиции Prometheus"""
+        lines = [
+            "# HELP dictionary_phase_seconds Длительность фаз поиска по источникам",
+            "# TYPE dictionary_phase_seconds histogram"
+        ]
+        with self.lock:
+            for (phase, upstream), histogram in sorted(self.histograms.items()):
+                labels = f'phase="{phase}",upstream="{upstream}"'
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'dictionary_phase_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'dictionary_phase_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"dictionary_phase_seconds_sum{{{labels}}} {histogram.total:.6f}")
+                lines.append(f"dictionary_phase_seconds_count{{{labels}}} {histogram.count}")
+
+            lines.append("# HELP dictionary_errors_total Ошибки по источникам и видам")
+            lines.append("# TYPE dictionary_errors_total counter")
+            for (upstream, kind), count in sorted(self.errors.items()):
+                lines.append(f'dictionary_errors_total{{upstream="{upstream}",kind="{kind}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Запись метрик в текстовый файл (например, для node_exporter textfile)"""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.errors.clear()
+
+
+# Общий реестр метрик приложения
+METRICS = Metrics()
@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from response_parsers import loads
+from result_model import LookupResult
+
+# Файл кэша лежит рядом со словарём
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dictionary_cache.db")
+
+
+class LookupCache:
+    """Двухуровневый кэш результатов поиска: LRU в памяти + SQLite на диске.
+
+    Записи старше ttl считаются устаревшими, но еще stale_ttl секунд
+    могут быть выданы через get_stale (stale-while-revalidate).
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, memory_size=512, disk_size=20000, ttl=7 * 24 * 3600,
+                 stale_ttl=30 * 24 * 3600):
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+        # Первый уровень: ключ -> (время истечения, LookupResult)
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+
+        # Счетчики для строки состояния
+        self.hits = 0
+        self.misses = 0
+
+        # Второй уровень: SQLite (доступ из потоков поиска через общий lock)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS lookups ("
+            " key TEXT PRIMARY KEY,"
+            " payload TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_lookups_accessed ON lookups (accessed_at)")
+        self.conn.execute("DELETE FROM lookups WHERE expires_at < ?", (time.time() - self.stale_ttl,))
+        self.conn.commit()
+        self.disk_count = self.conn.execute("SELECT COUNT(*) FROM lookups").fetchone()[0]
+
+    @staticmethod
+    def make_key(language, word):
+        """Нормализованный ключ кэша"""
+        return f"{language}:{word.strip().lower()}"
+
+    def get(self, language, word):
+        """Свежий результат из кэша или None"""
+        return self._read(language, word, allow_stale=False)[0]
+
+    def get_stale(self, language, word):
+        """(результат, устарел ли он) или (None, False).
+
+        Устаревшая запись возвращается, пока не прошло stale_ttl после истечения.
+        """
+        return self._read(language, word, allow_stale=True)
+
+    def _read(self, language, word, allow_stale):
+        key = self.make_key(language, word)
+        now = time.time()
+
+        with self.lock:
+            # 1. Память
+            entry = self.memory.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at >= now or (allow_stale and expires_at + self.stale_ttl >= now):
+                    self.memory.move_to_end(key)
+                    self.hits += 1
+                    return result, expires_at < now
+                if expires_at + self.stale_ttl < now:
+                    del self.memory[key]
+
+            # 2. Диск
+            row = self.conn.execute(
+                "SELECT payload, expires_at FROM lookups WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                payload, expires_at = row
+                if expires_at >= now or (allow_stale and expires_at + self.stale_ttl >= now):
+                    self.conn.execute("UPDATE lookups SET accessed_at = ? WHERE key = ?", (now, key))
+                    self.conn.commit()
+                    result = LookupResult.from_dict(loads(payload))
+                    self._remember(key, expires_at, result)
+                    self.hits += 1
+                    return result, expires_at < now
+                if expires_at + self.stale_ttl < now:
+                    self.conn.execute("DELETE FROM lookups WHERE key = ?", (key,))
+                    self.conn.commit()
+                    self.disk_count -= 1
+
+            self.misses += 1
+            return None, False
+
+    def touch(self, language, word, ttl=None):
+        """Продление записи без перезаписи данных (источник ответил, что ничего не изменилось)"""
+        key = self.make_key(language, word)
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                self.memory[key] = (expires_at, entry[1])
+            self.conn.execute("UPDATE lookups SET expires_at = ? WHERE key = ?", (expires_at, key))
+            self.conn.commit()
+
+    def contains(self, language, word):
+        """Есть ли свежая запись (без изменения счетчиков и порядка LRU)"""
+        key = self.make_key(language, word)
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None and entry[0] >= now:
+                return True
+            row = self.conn.execute(
+                "SELECT 1 FROM lookups WHERE key = ? AND expires_at >= ?", (key, now)
+            ).fetchone()
+            return row is not None
+
+    def put(self, language, word, result, ttl=None):
+        """Сохранение результата в оба уровня"""
+        key = self.make_key(language, word)
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        payload = json.dumps(result.to_dict(), ensure_ascii=False)
+
+        with self.lock:
+            self._remember(key, expires_at, result)
+
+            exists = self.conn.execute("SELECT 1 FROM lookups WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO lookups (key, payload, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, now)
+            )
+            if not exists:
+                self.disk_count += 1
+
+            # Вытесняем самые давно использованные записи
+            if self.disk_count > self.disk_size:
+                overflow = self.disk_count - self.disk_size
+                self.conn.execute(
+                    "DELETE FROM lookups WHERE key IN "
+                    "(SELECT key FROM lookups ORDER BY accessed_at LIMIT ?)", (overflow,)
+                )
+                self.disk_count -= overflow
+            self.conn.commit()
+
+    def _remember(self, key, expires_at, result):
+        """Запись в LRU в памяти (вызывается под lock)"""
+        self.memory[key] = (expires_at, result)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def words(self):
+        """Все слова, сохраненные на диске (без префикса языка)"""
+        with self.lock:
+            rows = self.conn.execute("SELECT key FROM lookups").fetchall()
+        return [key.split(":", 1)[1] for (key,) in rows]
+
+    def clear(self):
+        """Полная очистка кэша"""
+        with self.lock:
+            self.memory.clear()
+            self.conn.execute("DELETE FROM lookups")
+            self.conn.commit()
+            self.disk_count = 0
+
+    def stats_text(self):
+        """Строка со счетчиками для строки состояния"""
+        return f"Кэш: попаданий {self.hits}, промахов {self.misses}"
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
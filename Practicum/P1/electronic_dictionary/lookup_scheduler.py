@@ -0,0 +1,94 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SharedLookupPool:
+    """Ограниченный пул поисков: одновременные запросы одного и того же слова
+    выполняются один раз и получают общий Future (single-flight)"""
+
+    def __init__(self, lookup, max_workers=4, thread_name_prefix="lookup"):
+        # lookup(word, language) -> result
+        self.lookup = lookup
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        # RLock: отмена future синхронно вызывает _forget из-под той же блокировки
+        self.lock = threading.RLock()
+        self.in_flight = {}  # (language, слово) -> Future
+
+    @staticmethod
+    def make_key(word, language):
+        return language, word.strip().lower()
+
+    def submit(self, word, language):
+        key = self.make_key(word, language)
+        with self.lock:
+            future = self.in_flight.get(key)
+            if future is None:
+                future = self.executor.submit(self.lookup, word, language)
+                self.in_flight[key] = future
+                future.add_done_callback(lambda f, key=key: self._forget(key, f))
+            return future
+
+    def _forget(self, key, future):
+        with self.lock:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LookupScheduler:
+    """Планировщик поисков интерфейса: общий пул с объединением запросов
+    и отбрасывание устаревших результатов по номеру поколения"""
+
+    def __init__(self, lookup, max_workers=4):
+        self.pool = SharedLookupPool(lookup, max_workers=max_workers)
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.current_future = None
+
+    def submit(self, word, language, on_result, on_error):
+        """Запуск поиска, который заменяет все предыдущие.
+
+        on_result(token, result) и on_error(token, message) вызываются из рабочего
+        потока и только если за это время не был запущен более новый поиск.
+        Возвращает номер поколения (token) этого поиска.
+        """
+        with self.lock:
+            self.generation += 1
+            token = self.generation
+            future = self.pool.submit(word, language)
+
+            # Предыдущий поиск, который еще не начался, больше никому не нужен
+            previous = self.current_future
+            if previous is not None and previous is not future:
+                previous.cancel()
+            self.current_future = future
+
+        future.add_done_callback(lambda f: self._deliver(token, f, on_result, on_error))
+        return token
+
+    def _deliver(self, token, future, on_result, on_error):
+        if future.cancelled() or not self.is_current(token):
+            return
+        error = future.exception()
+        if error is not None:
+            on_error(token, str(error))
+        else:
+            on_result(token, future.result())
+
+    def is_current(self, token):
+        """Является ли поиск с этим номером последним запущенным"""
+        return token == self.generation
+
+    def cancel(self):
+        """Отмена текущего поиска: его результат будет отброшен"""
+        with self.lock:
+            self.generation += 1
+            if self.current_future is not None:
+                self.current_future.cancel()
+                self.current_future = None
+
+    def shutdown(self):
+        self.cancel()
+        self.pool.shutdown()
@@ -0,0 +1,164 @@
+"""Локальный HTTP-сервис перевода на основе DictionaryEngine.
+
+Запуск:
+    python lookup_service.py --port 8765
+
+Запросы:
+    GET  /lookup?word=hello          -> результат поиска (тот же словарь, что в DictionaryApp)
+    POST /batch  {"words": [...]}    -> {"results": [{"word": ..., "result"|"error": ...}, ...]}
+    GET  /health                     -> состояние сервиса и счетчики кэша
+    GET  /metrics                    -> задержки и ошибки по источникам (формат Prometheus)
+"""
+import sys
+import json
+import argparse
+from concurrent.futures import TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from dictionary_engine import DictionaryEngine
+from lookup_scheduler import SharedLookupPool
+from instrumentation import METRICS
+
+# Максимум слов в одном пакетном запросе
+MAX_BATCH_SIZE = 1000
+
+
+class LookupService:
+    """Общий движок, кэш и пулы соединений для всех клиентов сервиса"""
+
+    def __init__(self, engine, max_workers=32):
+        self.engine = engine
+        # Одновременные запросы одного слова от разных клиентов выполняются один раз;
+        # устаревшие записи кэша отдаются сразу и обновляются в фоне
+        self.pool = SharedLookupPool(
+            lambda word, language: engine.lookup_word(word, language, on_refresh=lambda *args: None),
+            max_workers=max_workers,
+            thread_name_prefix="service"
+        )
+        self.timeout = engine.search_deadline * 2
+
+    def lookup_futures(self, words):
+        """Запуск поиска для всех слов сразу, без ожидания"""
+        futures = []
+        for word in words:
+            word = str(word).strip()
+            language = self.engine.detect_language(word) if word else None
+            futures.append((word, language, self.pool.submit(word, language) if language else None))
+        return futures
+
+    def collect(self, word, language, future):
+        """Запись ответа для одного слова"""
+        if future is None:
+            return {"word": word, "error": "Не удалось определить язык слова"}
+        try:
+            return {"word": word, "result": future.result(timeout=self.timeout).to_dict()}
+        except FutureTimeout:
+            return {"word": word, "error": "Превышено время ожидания"}
+        except Exception as e:
+            return {"word": word, "error": str(e)}
+
+    def lookup(self, word):
+        return self.collect(*self.lookup_futures([word])[0])
+
+    def batch(self, words):
+        return [self.collect(*item) for item in self.lookup_futures(words)]
+
+    def health(self):
+        return {"status": "ok", "cache": self.engine.cache.stats_text()}
+
+    def make_server(self, host, port):
+        handler = type("BoundLookupRequestHandler", (LookupRequestHandler,), {"service": self})
+        server = ThreadingHTTPServer((host, port), handler)
+        server.daemon_threads = True
+        return server
+
+    def shutdown(self):
+        self.pool.shutdown()
+
+
+class LookupRequestHandler(BaseHTTPRequestHandler):
+    """Обработчик HTTP-запросов к сервису"""
+
+    service = None
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело уходят отдельными write: без TCP_NODELAY каждый ответ
+    # в keep-alive соединении ждал бы задержанного ACK клиента (~40 мс)
+    disable_nagle_algorithm = True
+
+    def send_body(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_body(status, body, "application/json; charset=utf-8")
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            self.send_json(200, self.service.health())
+        elif url.path == "/metrics":
+            self.send_body(200, METRICS.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8")
+        elif url.path == "/lookup":
+            word = parse_qs(url.query).get("word", [""])[0].strip()
+            if not word:
+                self.send_json(400, {"error": "Не указан параметр word"})
+                return
+            if self.service.engine.detect_language(word) is None:
+                self.send_json(400, {"error": "Не удалось определить язык слова"})
+                return
+            record = self.service.lookup(word)
+            self.send_json(200 if "result" in record else 502, record)
+        else:
+            self.send_json(404, {"error": "Неизвестный адрес"})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/batch":
+            self.send_json(404, {"error": "Неизвестный адрес"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            words = json.loads(self.rfile.read(length) or b"{}").get("words")
+        except (ValueError, AttributeError):
+            self.send_json(400, {"error": "Ожидается JSON вида {\"words\": [...]}"})
+            return
+        if not isinstance(words, list):
+            self.send_json(400, {"error": "Поле words должно быть списком"})
+            return
+        if len(words) > MAX_BATCH_SIZE:
+            self.send_json(413, {"error": f"Не больше {MAX_BATCH_SIZE} слов за запрос"})
+            return
+        self.send_json(200, {"results": self.service.batch(words)})
+
+    def log_message(self, format, *args):
+        # Журнал запросов не нужен в консоли при сотнях обращений
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Локальный HTTP-сервис словаря")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=32, help="число одновременных поисков")
+    args = parser.parse_args(argv)
+
+    engine = DictionaryEngine(upstream_workers=args.workers * 2)
+    service = LookupService(engine, max_workers=args.workers)
+    server = service.make_server(args.host, args.port)
+    print(f"Сервис словаря слушает http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""Офлайн-словарь: отсортированные ключи + смещения в memory-mapped файле данных.
+
+Сборка индекса из дампов (JSON или JSONL в форматах dictionaryapi.dev и Яндекс.Словаря):
+    python offline_index.py offline_dictionary english_dump.json yandex_en_ru.jsonl yandex_ru_en.jsonl
+"""
+import os
+import re
+import sys
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+
+from response_parsers import loads
+
+# Набор файлов по умолчанию рядом со словарём
+DEFAULT_INDEX_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "offline_dictionary")
+
+INDEX_MAGIC = b"DICTIDX1"
+
+# Разделы индекса
+SECTION_ENGLISH = "en"      # ответ dictionaryapi.dev (список статей)
+SECTION_EN_RU = "en-ru"     # ответ Яндекса для английского слова
+SECTION_RU_EN = "ru-en"     # ответ Яндекса для русского слова
+
+
+def make_key(section, word):
+    return f"{section}:{word.strip().lower()}"
+
+
+def iter_dump(path):
+    """Ответы API из дампа: один JSON-документ, JSON-список ответов или JSONL"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        data = json.load(f)
+    # Список ответов Яндекса или одна большая выгрузка dictionaryapi.dev
+    if isinstance(data, list) and data and isinstance(data[0], dict) and "def" in data[0]:
+        yield from data
+    else:
+        yield data
+
+
+def collect_entries(documents):
+    """Группировка статей по ключу раздела"""
+    entries = {}
+    for data in documents:
+        if isinstance(data, list):
+            # dictionaryapi.dev: список статей, у каждой есть 'word'
+            for entry in data:
+                word = entry.get("word")
+                if word:
+                    entries.setdefault(make_key(SECTION_ENGLISH, word), []).append(entry)
+        elif isinstance(data, dict):
+            # Яндекс: {'def': [{'text': ..., 'tr': [...]}]}
+            for definition in data.get("def", []):
+                text = definition.get("text", "")
+                if not text:
+                    continue
+                section = SECTION_RU_EN if re.search(r'[а-яА-ЯёЁ]', text) else SECTION_EN_RU
+                entries.setdefault(make_key(section, text), {"def": []})["def"].append(definition)
+    return entries
+
+
+def build_index(base_path, documents):
+    """Запись файлов <base>.idx и <base>.dat, возвращает число ключей"""
+    entries = collect_entries(documents)
+    keys = sorted(entries)
+
+    offsets = array("Q", [0])
+    with open(base_path + ".dat", "wb") as payload_file:
+        for key in keys:
+            blob = json.dumps(entries[key], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            payload_file.write(blob)
+            offsets.append(offsets[-1] + len(blob))
+
+    key_blob = "\n".join(keys).encode("utf-8")
+    with open(base_path + ".idx", "wb") as index_file:
+        index_file.write(INDEX_MAGIC)
+        index_file.write(struct.pack("<IQ", len(keys), len(key_blob)))
+        index_file.write(offsets.tobytes())
+        index_file.write(key_blob)
+
+    return len(keys)
+
+
+class OfflineIndex:
+    """Поиск по офлайн-индексу: бинарный поиск по ключам, данные читаются из mmap"""
+
+    def __init__(self, base_path):
+        with open(base_path + ".idx", "rb") as index_file:
+            if index_file.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ValueError(f"Неверный формат индекса: {base_path}.idx")
+            count, key_blob_size = struct.unpack("<IQ", index_file.read(12))
+            self.offsets = array("Q")
+            self.offsets.frombytes(index_file.read(8 * (count + 1)))
+            key_blob = index_file.read(key_blob_size).decode("utf-8")
+        self.keys = key_blob.split("\n") if count else []
+
+        self.payload_file = open(base_path + ".dat", "rb")
+        # mmap не умеет отображать пустой файл
+        self.payload = mmap.mmap(self.payload_file.fileno(), 0, access=mmap.ACCESS_READ) if self.offsets[-1] else b""
+
+    @classmethod
+    def open_default(cls, base_path=DEFAULT_INDEX_BASE):
+        """Индекс рядом со словарём, если он был собран, иначе None"""
+        if os.path.exists(base_path + ".idx") and os.path.exists(base_path + ".dat"):
+            return cls(base_path)
+        return None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def get(self, section, word):
+        """Сохраненный ответ API для слова или None"""
+        key = make_key(section, word)
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return loads(self.payload[self.offsets[i]:self.offsets[i + 1]])
+        return None
+
+    def words(self, section):
+        """Все заголовочные слова раздела (в порядке сортировки)"""
+        prefix = section + ":"
+        start = bisect_left(self.keys, prefix)
+        for key in self.keys[start:]:
+            if not key.startswith(prefix):
+                break
+            yield key[len(prefix):]
+
+    def close(self):
+        if isinstance(self.payload, mmap.mmap):
+            self.payload.close()
+        self.payload_file.close()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        print("Использование: python offline_index.py <база_индекса> <дамп.json|дамп.jsonl> ...", file=sys.stderr)
+        return 2
+
+    base_path, dump_paths = argv[0], argv[1:]
+    documents = (document for path in dump_paths for document in iter_dump(path))
+    count = build_index(base_path, documents)
+    print(f"Записано ключей: {count} ({base_path}.idx, {base_path}.dat)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from dictionary_transport import RateLimiter
+
+
+class Prefetcher:
+    """Фоновый прогрев кэша для слов, по которым пользователь, скорее всего,
+    перейдет дальше: синонимы и переводы текущего слова.
+
+    Работает в своем маленьком пуле с ограничением частоты запросов и
+    прекращается, как только пользователь начинает новый поиск.
+    """
+
+    def __init__(self, engine, pool, top_k=5, max_workers=2, requests_per_second=2.0):
+        self.engine = engine
+        # Общий пул поисков: если пользователь кликнет слово, которое сейчас
+        # прогревается, его поиск присоединится к уже идущему запросу
+        self.pool = pool
+        self.top_k = top_k
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self.rate_limiter = RateLimiter(requests_per_second, burst=1)
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.pending = []
+
+    def neighbours(self, result):
+        """Слова-соседи результата: top_k синонимов и top_k переводов"""
+        words = list(result.synonyms[:self.top_k])
+        if result.language == 'en':
+            words.extend(result.russian_translation[:self.top_k])
+        else:
+            words.extend(sense.meaning for sense in result.translation[:self.top_k])
+
+        # Без повторов и без самого слова
+        seen = {result.original_word.strip().lower()}
+        unique = []
+        for word in words:
+            key = word.strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                unique.append(word.strip())
+        return unique
+
+    def schedule(self, result):
+        """Прогрев соседей нового результата (предыдущий прогрев отменяется)"""
+        self.cancel()
+        with self.lock:
+            generation = self.generation
+            for word in self.neighbours(result):
+                language = self.engine.detect_language(word)
+                if language and not self.engine.cache.contains(language, word):
+                    self.pending.append(self.executor.submit(self._warm, generation, word, language))
+
+    def _warm(self, generation, word, language):
+        if generation != self.generation:
+            return
+        self.rate_limiter.acquire()
+        # Пока ждали своей очереди, пользователь мог начать новый поиск
+        if generation != self.generation or self.engine.cache.contains(language, word):
+            return
+        try:
+            self.pool.submit(word, language).result()
+        except Exception:
+            pass  # Ошибка прогрева не важна: при клике слово будет найдено обычным путем
+
+    def cancel(self):
+        """Остановка прогрева: ожидающие задачи отменяются, идущие запросы не начнут новых"""
+        with self.lock:
+            self.generation += 1
+            for future in self.pending:
+                future.cancel()
+            self.pending = []
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
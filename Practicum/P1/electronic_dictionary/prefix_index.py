@@ -0,0 +1,48 @@
+import threading
+from bisect import bisect_left
+
+
+class PrefixIndex:
+    """Автодополнение по префиксу: отсортированный массив слов + bisect"""
+
+    def __init__(self, words=()):
+        self.lock = threading.Lock()
+        self.words = sorted(set(self.normalize(word) for word in words if word.strip()))
+
+    @staticmethod
+    def normalize(word):
+        return word.strip().lower()
+
+    def __len__(self):
+        return len(self.words)
+
+    def add(self, word):
+        """Добавление одного слова (например, только что найденного)"""
+        word = self.normalize(word)
+        if not word:
+            return
+        with self.lock:
+            i = bisect_left(self.words, word)
+            if i == len(self.words) or self.words[i] != word:
+                self.words.insert(i, word)
+
+    def update(self, words):
+        """Добавление множества слов с одной пересортировкой"""
+        new_words = set(self.normalize(word) for word in words if word.strip())
+        with self.lock:
+            new_words.update(self.words)
+            self.words = sorted(new_words)
+
+    def complete(self, prefix, limit=10):
+        """Первые limit слов, начинающихся с prefix"""
+        prefix = self.normalize(prefix)
+        if not prefix:
+            return []
+        # Ссылка на список берется один раз: update() заменяет его целиком
+        words = self.words
+        i = bisect_left(words, prefix)
+        result = []
+        while i < len(words) and len(result) < limit and words[i].startswith(prefix):
+            result.append(words[i])
+            i += 1
+        return result
@@ -0,0 +1,133 @@
+"""Разбор ответов dictionaryapi.dev и Яндекс.Словаря в LookupResult.
+
+Все статьи и значения сохраняются: плоский кортеж result.translation
+(каждое значение знает свою часть речи) плюс result.entries с диапазонами
+этого кортежа для каждой статьи.
+"""
+import json
+from sys import intern
+
+# Быстрый декодер JSON, если установлен (pip install orjson)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from result_model import Sense, Entry, intern_text
+
+
+def loads(data):
+    """Декодирование JSON из bytes/str: orjson, если доступен, иначе json"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def unique(items):
+    """Удаление повторов и пустых строк с сохранением порядка"""
+    return [item for item in dict.fromkeys(items) if item]
+
+
+def parse_english_response(data, word, result):
+    """Парсинг ответа от английского API (все статьи, все значения)"""
+    if not isinstance(data, list):
+        return result
+
+    translation = list(result.translation)
+    synonyms = list(result.synonyms)
+    examples = list(result.examples)
+    entries = list(result.entries)
+    parts_of_speech = []
+
+    for entry in data:
+        # Фонетика: первая непустая по всем статьям
+        phonetic = entry.get('phonetic', '')
+        if not phonetic:
+            for ph in entry.get('phonetics', ()):
+                if ph.get('text'):
+                    phonetic = ph['text']
+                    break
+        if phonetic and not result.phonetics:
+            result.phonetics = phonetic
+
+        meanings = []
+        for meaning in entry.get('meanings', ()):
+            pos = intern_text(meaning.get('partOfSpeech', ''))
+            parts_of_speech.append(pos)
+            start = len(translation)
+
+            for definition in meaning.get('definitions', ()):
+                definition_synonyms = tuple(map(intern, definition.get('synonyms', ())))
+                example = definition.get('example', '')
+                translation.append(Sense(definition.get('definition', ''), definition_synonyms, example, pos))
+                synonyms.extend(definition_synonyms)
+                if example:
+                    examples.append(example)
+
+            # Общие синонимы значения
+            synonyms.extend(map(intern, meaning.get('synonyms', ())))
+            meanings.append((pos, start, len(translation)))
+
+        entries.append(Entry(phonetic, entry.get('origin', ''), tuple(meanings)))
+
+    # Основная часть речи - первая, а не последняя
+    parts_of_speech = unique(parts_of_speech)
+    if parts_of_speech and not result.part_of_speech:
+        result.part_of_speech = parts_of_speech[0]
+    result.parts_of_speech = tuple(parts_of_speech)
+    result.translation = tuple(translation)
+    result.synonyms = tuple(unique(synonyms))
+    result.examples = tuple(examples)
+    result.entries = tuple(entries)
+    return result
+
+
+def parse_russian_response(data, word, result):
+    """Парсинг ответа от Яндекс.Словаря (все определения и переводы)"""
+    translation = list(result.translation)
+    synonyms = list(result.synonyms)
+    examples = list(result.examples)
+    entries = list(result.entries)
+    parts_of_speech = []
+
+    for definition in data.get('def', ()):
+        pos = intern_text(definition.get('pos', 'noun'))
+        parts_of_speech.append(pos)
+
+        # Транскрипция: первая непустая
+        if definition.get('ts') and not result.phonetics:
+            result.phonetics = definition['ts']
+
+        start = len(translation)
+        for tr in definition.get('tr', ()):
+            translation_synonyms = tuple(intern(syn['text']) for syn in tr.get('syn', ()) if syn.get('text'))
+            synonyms.extend(translation_synonyms)
+
+            # Пример: первый с текстом
+            example_text = ''
+            for ex in tr.get('ex', ()):
+                if 'text' in ex:
+                    ex_translations = ex.get('tr') or [{}]
+                    example_text = f"{ex['text']} - {ex_translations[0].get('text', '')}"
+                    examples.append(example_text)
+                    break
+
+            translation.append(Sense(tr.get('text', ''), translation_synonyms, example_text,
+                                     intern_text(tr.get('pos', pos))))
+
+        entries.append(Entry(definition.get('ts', ''), '', ((pos, start, len(translation)),)))
+
+    parts_of_speech = unique(parts_of_speech)
+    if parts_of_speech and not result.part_of_speech:
+        result.part_of_speech = parts_of_speech[0]
+    result.parts_of_speech = tuple(parts_of_speech)
+    result.translation = tuple(translation)
+    result.synonyms = tuple(unique(synonyms))
+    result.examples = tuple(examples)
+    result.entries = tuple(entries)
+    return result
+
+
+def extract_russian_translations(data):
+    """Кортеж переводов из ответа Яндекса (без повторов, в порядке ответа)"""
+    return tuple(unique(tr.get('text', '') for definition in data.get('def', ()) for tr in definition.get('tr', ())))
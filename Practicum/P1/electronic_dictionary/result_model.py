@@ -0,0 +1,127 @@
+"""Компактная модель результата поиска.
+
+Результат - объект со __slots__, значения и статьи - кортежи (namedtuple).
+Части речи и синонимы интернируются: одинаковые строки во всех записях
+кэша хранятся в памяти один раз. На границах с JSON (кэш на диске,
+HTTP-сервис, пакетный режим) используются to_dict/from_dict.
+"""
+import sys
+from collections import namedtuple
+
+# Одно значение (перевод): текст, кортеж синонимов, пример, часть речи
+Sense = namedtuple('Sense', 'meaning synonyms example part_of_speech')
+
+# Статья словаря: транскрипция, происхождение и кортеж (часть речи, начало, конец)
+# с диапазонами значений в общем кортеже translation
+Entry = namedtuple('Entry', 'phonetics origin meanings')
+
+
+def intern_text(text):
+    """Общая копия строки (пустая строка остается пустой)"""
+    return sys.intern(text) if text else ''
+
+
+def intern_all(items):
+    """Кортеж общих копий непустых строк"""
+    return tuple(sys.intern(item) for item in items if item)
+
+
+class LookupResult:
+    """Результат поиска слова"""
+
+    __slots__ = ('original_word', 'language', 'translation', 'phonetics', 'part_of_speech',
+                 'parts_of_speech', 'synonyms', 'examples', 'russian_translation', 'entries',
+                 'partial', 'missing', 'suggestions')
+
+    # Служебные поля: не относятся к содержимому словарной статьи
+    SERVICE_FIELDS = ('partial', 'missing', 'suggestions')
+
+    def __init__(self, original_word, language, translation=(), phonetics='', part_of_speech='',
+                 parts_of_speech=(), synonyms=(), examples=(), russian_translation=(), entries=(),
+                 partial=False, missing=(), suggestions=()):
+        self.original_word = original_word
+        self.language = language
+        self.translation = translation
+        self.phonetics = phonetics
+        self.part_of_speech = part_of_speech
+        self.parts_of_speech = parts_of_speech
+        self.synonyms = synonyms
+        self.examples = examples
+        self.russian_translation = russian_translation
+        self.entries = entries
+        self.partial = partial
+        self.missing = missing
+        self.suggestions = suggestions
+
+    def found(self):
+        """Найдено ли хоть что-нибудь"""
+        return bool(self.translation or self.russian_translation)
+
+    def content(self):
+        """Содержимое без служебных полей (для сравнения версий)"""
+        return tuple(getattr(self, name) for name in self.__slots__ if name not in self.SERVICE_FIELDS)
+
+    def same_content(self, other):
+        """Совпадают ли результаты без учета служебных полей"""
+        return self.content() == other.content()
+
+    def to_dict(self):
+        """Словарь в прежнем формате (для JSON)"""
+        data = {
+            'original_word': self.original_word,
+            'language': self.language,
+            'translation': [{
+                'meaning': sense.meaning,
+                'synonyms': list(sense.synonyms),
+                'example': sense.example,
+                'part_of_speech': sense.part_of_speech
+            } for sense in self.translation],
+            'phonetics': self.phonetics,
+            'part_of_speech': self.part_of_speech,
+            'parts_of_speech': list(self.parts_of_speech),
+            'synonyms': list(self.synonyms),
+            'examples': list(self.examples),
+            'entries': [{
+                'phonetics': entry.phonetics,
+                'origin': entry.origin,
+                'meanings': [list(meaning) for meaning in entry.meanings]
+            } for entry in self.entries],
+            'partial': self.partial,
+            'missing': list(self.missing)
+        }
+        if self.language == 'en':
+            data['russian_translation'] = list(self.russian_translation)
+        if self.suggestions:
+            data['suggestions'] = list(self.suggestions)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Результат из словаря (в том числе из старых записей кэша без новых полей)"""
+        return cls(
+            data['original_word'],
+            data['language'],
+            translation=tuple(Sense(
+                item.get('meaning', ''),
+                intern_all(item.get('synonyms', ())),
+                item.get('example', ''),
+                intern_text(item.get('part_of_speech', ''))
+            ) for item in data.get('translation', ())),
+            phonetics=data.get('phonetics', ''),
+            part_of_speech=intern_text(data.get('part_of_speech', '')),
+            parts_of_speech=intern_all(data.get('parts_of_speech', ())),
+            synonyms=intern_all(data.get('synonyms', ())),
+            examples=tuple(data.get('examples', ())),
+            russian_translation=tuple(data.get('russian_translation', ())),
+            entries=tuple(Entry(
+                entry.get('phonetics', ''),
+                entry.get('origin', ''),
+                tuple((intern_text(pos), start, end) for pos, start, end in entry.get('meanings', ()))
+            ) for entry in data.get('entries', ())),
+            partial=data.get('partial', False),
+            missing=tuple(data.get('missing', ())),
+            suggestions=tuple(data.get('suggestions', ()))
+        )
+
+    def __repr__(self):
+        return f"LookupResult({self.original_word!r}, {self.language!r}, {len(self.translation)} значений)"
@@ -0,0 +1,202 @@
+import tkinter as tk
+
+# Части речи на русском
+POS_DISPLAY = {
+    'noun': 'существительное',
+    'verb': 'глагол',
+    'adjective': 'прилагательное',
+    'adverb': 'наречие',
+    'pronoun': 'местоимение',
+    'preposition': 'предлог',
+    'conjunction': 'союз',
+    'interjection': 'междометие'
+}
+
+# Сколько элементов каждого раздела видно сразу, остальное раскрывается по клику
+DEFAULT_LIMITS = {
+    'russian_translation': 5,
+    'translation': 5,
+    'synonyms': 10,
+    'examples': 3
+}
+
+
+def numbered_segments(items, start, text_tag, number_tag):
+    """Нумерованный список строк"""
+    segments = []
+    for i, item in enumerate(items, start):
+        segments.append((f"{i}. ", number_tag))
+        segments.append((f"{item}\n", text_tag))
+    return segments
+
+
+def meaning_segments(translations, start, previous_pos=None):
+    """Значения/переводы с синонимами и примерами; при смене части речи - подзаголовок"""
+    segments = []
+    for i, trans in enumerate(translations, start):
+        pos = trans.part_of_speech
+        if pos and pos != previous_pos:
+            segments.append((f"[{POS_DISPLAY.get(pos, pos)}]\n", "pos"))
+        previous_pos = pos or previous_pos
+
+        segments.append((f"{i}. ", "translation_num"))
+        segments.append((f"{trans.meaning}\n", "translation"))
+
+        # Синонимы для данного перевода
+        if trans.synonyms:
+            synonyms_text = ", ".join(trans.synonyms[:3])
+            segments.append((f"   Синонимы: {synonyms_text}\n", "synonyms"))
+
+        # Пример использования
+        if trans.example:
+            segments.append((f"   Пример: {trans.example}\n", "example"))
+
+        segments.append(("\n", ""))
+    return segments
+
+
+class ResultRenderer:
+    """Отрисовка результата в Text: сначала строится плоский список (текст, тег),
+    затем он вставляется одним вызовом insert. Длинные разделы свернуты
+    и достраиваются только при раскрытии."""
+
+    def __init__(self, text_widget, limits=None):
+        self.text = text_widget
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        # Отложенные части разделов: имя раздела -> функция, возвращающая сегменты
+        self.collapsed = {}
+
+        self.text.tag_configure("expand", font=("Consolas", 10, "underline"), foreground="#1565C0")
+        self.text.tag_bind("expand", "<Button-1>", self.on_expand_click)
+        self.text.tag_bind("expand", "<Enter>", lambda e: self.text.config(cursor="hand2"))
+        self.text.tag_bind("expand", "<Leave>", lambda e: self.text.config(cursor=""))
+
+    def render(self, result):
+        """Полная перерисовка результата"""
+        for section in self.collapsed:
+            self.text.tag_delete(f"expand:{section}")
+        self.collapsed.clear()
+
+        self.text.delete(1.0, tk.END)
+        self.apply(tk.END, self.build_segments(result))
+
+    def apply(self, index, segments):
+        """Вставка всех сегментов одним вызовом"""
+        if not segments:
+            return
+        args = []
+        for text, tag in segments:
+            args.append(text)
+            args.append(tag)
+        self.text.insert(index, *args)
+
+    def collapse(self, section, hidden_count, label, build_rest):
+        """Ссылка-заглушка вместо скрытой части раздела"""
+        self.collapsed[section] = build_rest
+        return [(f"▸ {label}: ещё {hidden_count}\n", ("expand", f"expand:{section}"))]
+
+    def build_segments(self, result):
+        """Плоский список (текст, тег) для всего результата"""
+        segments = []
+        language = result.language
+
+        # Заголовок с названием слова
+        if language == 'ru':
+            segments.append((f"РУССКОЕ СЛОВО: {result.original_word}\n", "header"))
+        else:
+            segments.append((f"АНГЛИЙСКОЕ СЛОВО: {result.original_word.capitalize()}\n", "header"))
+        segments.append(("---\n\n", "divider"))
+
+        # Часть речи
+        if result.part_of_speech:
+            pos = result.part_of_speech
+            segments.append(("Часть речи: ", "pos"))
+            segments.append((f"{POS_DISPLAY.get(pos, pos)}\n\n", "translation"))
+
+        # Транскрипция (для английских слов)
+        if language == 'en' and result.phonetics:
+            segments.append(("Транскрипция: ", "pos"))
+            segments.append((f"[{result.phonetics}]\n\n", "translation"))
+
+        # Перевод на английский (для русских слов)
+        if language == 'ru' and result.translation:
+            segments.append(("Слово на английском: ", "pos"))
+            segments.append((f"{result.translation[0].meaning}\n\n", "translation"))
+
+        # Перевод на русский (для английских слов)
+        russian = result.russian_translation
+        if language == 'en' and russian:
+            limit = self.limits['russian_translation']
+            segments.append(("Перевод на русский:\n", "pos"))
+            segments.extend(numbered_segments(russian[:limit], 1, "translation", "translation_num"))
+            if len(russian) > limit:
+                segments.extend(self.collapse(
+                    'russian_translation', len(russian) - limit, "Переводы",
+                    lambda: numbered_segments(russian[limit:], limit + 1, "translation", "translation_num")
+                ))
+            segments.append(("\n", ""))
+
+        # Определения/переводы
+        translations = result.translation
+        if translations:
+            limit = self.limits['translation']
+            segments.append(("Значения:\n" if language == 'en' else "Переводы:\n", "pos"))
+            segments.extend(meaning_segments(translations[:limit], 1, result.part_of_speech))
+            if len(translations) > limit:
+                segments.extend(self.collapse(
+                    'translation', len(translations) - limit, "Значения",
+                    lambda: meaning_segments(translations[limit:], limit + 1,
+                                             translations[limit - 1].part_of_speech)
+                ))
+                segments.append(("\n", ""))
+
+        # Общие синонимы
+        synonyms = result.synonyms
+        if synonyms:
+            limit = self.limits['synonyms']
+            segments.append(("Синонимы:\n", "pos"))
+            segments.append((", ".join(synonyms[:limit]) + "\n", "synonyms"))
+            if len(synonyms) > limit:
+                segments.extend(self.collapse(
+                    'synonyms', len(synonyms) - limit, "Синонимы",
+                    lambda: [(", ".join(synonyms[limit:]) + "\n", "synonyms")]
+                ))
+            segments.append(("\n", ""))
+
+        # Примеры использования
+        examples = result.examples
+        if examples:
+            limit = self.limits['examples']
+            segments.append(("Примеры использования:\n", "pos"))
+            segments.extend(numbered_segments(examples[:limit], 1, "example", "example"))
+            if len(examples) > limit:
+                segments.extend(self.collapse(
+                    'examples', len(examples) - limit, "Примеры",
+                    lambda: numbered_segments(examples[limit:], limit + 1, "example", "example")
+                ))
+
+        # Возможные исправления для ненайденного слова
+        if result.suggestions:
+            segments.append(("Слово не найдено. Возможно, вы имели в виду:\n", "pos"))
+            for suggestion in result.suggestions:
+                segments.append(("• ", "translation"))
+                segments.append((suggestion, "correction"))
+                segments.append(("\n", ""))
+
+        return segments
+
+    def on_expand_click(self, event):
+        """Раскрытие свернутого раздела на месте ссылки"""
+        index = self.text.index(f"@{event.x},{event.y}")
+        for tag in self.text.tag_names(index):
+            section = tag.partition("expand:")[2]
+            if section in self.collapsed:
+                break
+        else:
+            return
+
+        start, end = self.text.tag_ranges(f"expand:{section}")[:2]
+        build_rest = self.collapsed.pop(section)
+        self.text.delete(start, end)
+        self.apply(start, build_rest())
+        self.text.tag_delete(f"expand:{section}")
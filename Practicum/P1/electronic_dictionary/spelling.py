@@ -0,0 +1,109 @@
+import re
+import threading
+
+
+def edit_distance(a, b, max_distance):
+    """Расстояние Дамерау-Левенштейна (OSA) с отсечкой по max_distance.
+
+    Если расстояние больше max_distance, возвращает max_distance + 1.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            # Перестановка соседних символов
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+
+    return min(previous[-1], max_distance + 1)
+
+
+def script_of(word):
+    """Алфавит слова - так же, как в detect_language"""
+    if re.search(r'[а-яА-ЯёЁ]', word):
+        return 'ru'
+    elif re.search(r'[a-zA-Z]', word):
+        return 'en'
+    return None
+
+
+class SpellingIndex:
+    """Исправление опечаток в стиле SymSpell: индекс удалений символов.
+
+    Для каждого слова заранее сохраняются все варианты его префикса
+    с удаленными 1..max_distance символами. Запрос порождает такие же
+    варианты и проверяет только слова с общими вариантами.
+    """
+
+    def __init__(self, words=(), max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.deletes = {}
+        self.words = set()
+        self.lock = threading.Lock()
+        self.update(words)
+
+    def __len__(self):
+        return len(self.words)
+
+    def generate_deletes(self, word):
+        """Все варианты слова с удалением до max_distance символов (включая само слово)"""
+        result = {word}
+        frontier = {word}
+        for _ in range(self.max_distance):
+            next_frontier = set()
+            for item in frontier:
+                if len(item) <= 1:
+                    continue
+                for i in range(len(item)):
+                    next_frontier.add(item[:i] + item[i + 1:])
+            next_frontier -= result
+            result |= next_frontier
+            frontier = next_frontier
+        return result
+
+    def add(self, word):
+        word = word.strip().lower()
+        if not word or word in self.words:
+            return
+        with self.lock:
+            self.words.add(word)
+            for variant in self.generate_deletes(word[:self.prefix_length]):
+                self.deletes.setdefault(variant, []).append(word)
+
+    def update(self, words):
+        for word in words:
+            self.add(word)
+
+    def suggest(self, word, limit=5):
+        """Кандидаты с расстоянием 1..max_distance, ближайшие первыми"""
+        query = word.strip().lower()
+        if not query:
+            return []
+        script = script_of(query)
+
+        distances = {}
+        for variant in self.generate_deletes(query[:self.prefix_length]):
+            for candidate in self.deletes.get(variant, ()):
+                if candidate in distances or candidate == query:
+                    continue
+                distances[candidate] = edit_distance(query, candidate, self.max_distance)
+
+        ranked = sorted(
+            (distance, abs(len(candidate) - len(query)), candidate)
+            for candidate, distance in distances.items()
+            if distance <= self.max_distance and script_of(candidate) == script
+        )
+        return [candidate for _, _, candidate in ranked[:limit]]
@@ -0,0 +1,84 @@
+"""Микро-замеры хранилищ поля: проверка столкновения и очистка линий.
+
+Запуск:
+    python bench_board.py --repeat 200000
+"""
+import sys
+import time
+import random
+import argparse
+
+from tetris_board import BitBoard, ListBoard, orientation_of
+from tetris_core import SHAPES, GRID_WIDTH, GRID_HEIGHT
+
+
+def fill_board(board_class, full_lines, seed=1):
+    """Поле с мусором в нижней половине и full_lines заполненными строками внизу"""
+    rng = random.Random(seed)
+    board = board_class(GRID_WIDTH, GRID_HEIGHT)
+    single = orientation_of([[1]])
+    for y in range(GRID_HEIGHT // 2, GRID_HEIGHT):
+        full = y >= GRID_HEIGHT - full_lines
+        hole = rng.randrange(GRID_WIDTH)
+        for x in range(GRID_WIDTH):
+            if full or x != hole:
+                board.place(single, x, y, 1)
+    return board
+
+
+def measure(label, func, repeat):
+    """Среднее время одного вызова в наносекундах"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<40} {elapsed * 1e9:10.0f} нс")
+    return elapsed
+
+
+def bench_fits(board_class, repeat):
+    """Проверка всех фигур во всех столбцах на двух высотах (свободно и занято)"""
+    board = fill_board(board_class, 0)
+    positions = [(orientation_of(shape), x, y)
+                 for shape in SHAPES
+                 for x in range(-1, GRID_WIDTH)
+                 for y in (2, GRID_HEIGHT // 2)]
+    fits = board.fits
+
+    def run():
+        for orientation, x, y in positions:
+            fits(orientation, x, y)
+
+    return measure(f"{board_class.__name__}.fits x{len(positions)}", run, repeat // len(positions)) / len(positions)
+
+
+def bench_clear(board_class, full_lines, repeat):
+    """Очистка линий на заранее построенных полях (построение не входит в замер)"""
+    template = fill_board(board_class, full_lines)
+    boards = [template.copy() for _ in range(repeat)]
+    iterator = iter(boards)
+    return measure(f"{board_class.__name__}.clear_lines ({full_lines} линии)",
+                   lambda: next(iterator).clear_lines(), repeat)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Микро-замеры хранилищ поля Тетриса")
+    parser.add_argument("--repeat", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for board_class in (ListBoard, BitBoard):
+        results[board_class, "fits"] = bench_fits(board_class, args.repeat * 10)
+        for full_lines in (0, 4):
+            results[board_class, full_lines] = bench_clear(board_class, full_lines, args.repeat)
+
+    print()
+    print(f"Ускорение fits:              x{results[ListBoard, 'fits'] / results[BitBoard, 'fits']:.1f}")
+    for full_lines in (0, 4):
+        print(f"Ускорение clear_lines ({full_lines}):    "
+              f"x{results[ListBoard, full_lines] / results[BitBoard, full_lines]:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
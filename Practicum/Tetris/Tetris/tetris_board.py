@@ -0,0 +1,165 @@
+"""Игровое поле Тетриса: два хранилища с одинаковым интерфейсом.
+
+ListBoard - список строк по клеткам (как было в игре изначально).
+BitBoard  - каждая строка - целое число-маска, фигура - маски своих строк:
+            столкновение - несколько AND, очистка линии - сравнение с полной маской.
+
+Интерфейс поля:
+    fits(orientation, x, y)          - помещается ли фигура
+    copy()                           - независимая копия (для перебора ходов)
+    place(orientation, x, y, value)  - закрепить фигуру (value - номер цвета + 1)
+    clear_lines()                    - убрать заполненные строки, вернуть их число
+    grid                             - строки значений клеток для отрисовки
+"""
+
+
+class Orientation:
+    """Фигура в одном повороте: клетки, маски строк и границы (только для чтения)"""
+
+    __slots__ = ('shape', 'cells', 'rows', 'nibbles', 'left', 'right', 'bottom')
+
+    def __init__(self, shape):
+        self.shape = tuple(tuple(row) for row in shape)
+        self.cells = tuple((x, y) for y, row in enumerate(shape) for x, cell in enumerate(row) if cell)
+        # (dy, маска строки) для непустых строк: бит x - клетка в столбце x относительно левого края
+        self.rows = tuple((dy, sum(1 << x for x, cell in enumerate(row) if cell))
+                          for dy, row in enumerate(shape) if any(row))
+        # (dy, маска полубайтов): единица в каждом занятом 4-битном поле - для записи цвета
+        self.nibbles = tuple((dy, sum(1 << (4 * x) for x, cell in enumerate(row) if cell))
+                             for dy, row in enumerate(shape) if any(row))
+        self.left = min(x for x, _ in self.cells)
+        self.right = max(x for x, _ in self.cells)
+        self.bottom = max(y for _, y in self.cells)
+
+
+# Одинаковые матрицы фигур разбираются один раз
+_orientations = {}
+
+
+def orientation_of(shape):
+    """Orientation для матрицы фигуры (с кэшем)"""
+    key = tuple(tuple(row) for row in shape)
+    orientation = _orientations.get(key)
+    if orientation is None:
+        orientation = _orientations[key] = Orientation(shape)
+    return orientation
+
+
+# Ширина стенок и высота пола BitBoard (наибольший размер фигуры - 4)
+PAD = 4
+
+
+class ListBoard:
+    """Поле как список строк клеток"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.grid = [[0] * width for _ in range(height)]
+
+    def copy(self):
+        board = ListBoard(self.width, self.height)
+        board.grid = [row[:] for row in self.grid]
+        return board
+
+    def fits(self, orientation, x, y):
+        grid = self.grid
+        for cell_x, cell_y in orientation.cells:
+            bx = x + cell_x
+            by = y + cell_y
+            if bx < 0 or bx >= self.width or by >= self.height or (by >= 0 and grid[by][bx]):
+                return False
+        return True
+
+    def place(self, orientation, x, y, value):
+        for cell_x, cell_y in orientation.cells:
+            if y + cell_y >= 0:
+                self.grid[y + cell_y][x + cell_x] = value
+
+    def clear_lines(self):
+        lines_to_clear = [y for y in range(self.height) if all(self.grid[y])]
+        for line in lines_to_clear:
+            del self.grid[line]
+            self.grid.insert(0, [0] * self.width)
+        return len(lines_to_clear)
+
+
+class BitBoard:
+    """Поле как маски строк.
+
+    Столбец x хранится в бите x + PAD; биты слева и справа от поля заняты
+    "стенками", а под полем лежит PAD заполненных строк "пола", поэтому
+    проверка границ сводится к тем же AND. Цвета клеток - отдельные целые
+    числа по 4 бита на клетку, нужны только для отрисовки.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        columns = ((1 << width) - 1) << PAD
+        self.full = (1 << (width + 2 * PAD)) - 1
+        self.empty = self.full & ~columns
+        self.rows = [self.empty] * height + [self.full] * PAD
+        self.colors = [0] * height
+
+    def copy(self):
+        board = BitBoard.__new__(BitBoard)
+        board.width = self.width
+        board.height = self.height
+        board.full = self.full
+        board.empty = self.empty
+        board.rows = self.rows[:]
+        board.colors = self.colors[:]
+        return board
+
+    def fits(self, orientation, x, y):
+        if not -PAD <= x < self.width:
+            return False
+        rows = self.rows
+        shift = x + PAD
+        if y >= 0:
+            for dy, mask in orientation.rows:
+                if rows[y + dy] & (mask << shift):
+                    return False
+            return True
+        # Фигура частично выше поля: строки над ним не проверяются, стенки - явно
+        if x + orientation.left < 0 or x + orientation.right >= self.width:
+            return False
+        for dy, mask in orientation.rows:
+            if y + dy >= 0 and rows[y + dy] & (mask << shift):
+                return False
+        return True
+
+    def place(self, orientation, x, y, value):
+        rows = self.rows
+        colors = self.colors
+        shift = x + PAD
+        for dy, mask in orientation.rows:
+            if y + dy >= 0:
+                rows[y + dy] |= mask << shift
+        for dy, nibbles in orientation.nibbles:
+            if y + dy >= 0:
+                colors[y + dy] |= (nibbles * value) << (4 * x) if x >= 0 else (nibbles * value) >> (-4 * x)
+
+    def clear_lines(self):
+        rows = self.rows
+        full = self.full
+        first = rows.index(full)
+        if first >= self.height:
+            return 0
+        colors = self.colors
+        cleared = 0
+        for y in range(first, self.height):
+            if rows[y] == full:
+                del rows[y]
+                rows.insert(0, self.empty)
+                del colors[y]
+                colors.insert(0, 0)
+                cleared += 1
+        return cleared
+
+    @property
+    def grid(self):
+        """Строки значений клеток (для отрисовки)"""
+        width = self.width
+        return [[(row >> (4 * x)) & 15 for x in range(width)] for row in self.colors]
@@ -0,0 +1,343 @@
+"""Правила Тетриса без pygame: поле, фигуры, гравитация, очки.
+
+TetrisEngine можно гонять без окна и без ограничения кадров: для тестов,
+ботов и проверки счета (одинаковые seed и действия дают одинаковую игру).
+Графическая версия (tetris_game.py) - один из клиентов этого движка.
+
+Замер скорости:
+    python tetris_core.py --pieces 100000
+"""
+import sys
+import time
+import random
+import argparse
+
+from tetris_board import BitBoard, ListBoard, orientation_of
+
+GRID_WIDTH = 10
+GRID_HEIGHT = 20
+
+# Фигуры Тетриса (I, J, L, O, S, T, Z)
+SHAPES = [
+    [[1, 1, 1, 1]],
+    [[1, 0, 0], [1, 1, 1]],
+    [[0, 0, 1], [1, 1, 1]],
+    [[1, 1], [1, 1]],
+    [[0, 1, 1], [1, 1, 0]],
+    [[0, 1, 0], [1, 1, 1]],
+    [[1, 1, 0], [0, 1, 1]]
+]
+
+# Очки за 1-4 линии одним ходом (умножаются на 100 и на уровень)
+LINE_SCORES = (1, 2, 5, 10)
+
+I_PIECE = 0
+O_PIECE = 3
+
+# Смещения при повороте (wall kick) по таблицам SRS: (из поворота, в поворот) -> [(dx, dy), ...].
+# Повороты: 0 - начальный, 1 - по часовой (R), 2 - перевернут, 3 - против часовой (L).
+# В SRS ось y направлена вверх, здесь - вниз, поэтому знак dy изменен.
+KICKS_JLSTZ = {
+    (0, 1): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (1, 0): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (1, 2): ((0, 0), (1, 0), (1, 1), (0, -2), (1, -2)),
+    (2, 1): ((0, 0), (-1, 0), (-1, -1), (0, 2), (-1, 2)),
+    (2, 3): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2)),
+    (3, 2): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (3, 0): ((0, 0), (-1, 0), (-1, 1), (0, -2), (-1, -2)),
+    (0, 3): ((0, 0), (1, 0), (1, -1), (0, 2), (1, 2))
+}
+KICKS_I = {
+    (0, 1): ((0, 0), (-2, 0), (1, 0), (-2, 1), (1, -2)),
+    (1, 0): ((0, 0), (2, 0), (-1, 0), (2, -1), (-1, 2)),
+    (1, 2): ((0, 0), (-1, 0), (2, 0), (-1, -2), (2, 1)),
+    (2, 1): ((0, 0), (1, 0), (-2, 0), (1, 2), (-2, -1)),
+    (2, 3): ((0, 0), (2, 0), (-1, 0), (2, -1), (-1, 2)),
+    (3, 2): ((0, 0), (-2, 0), (1, 0), (-2, 1), (1, -2)),
+    (3, 0): ((0, 0), (1, 0), (-2, 0), (1, 2), (-2, -1)),
+    (0, 3): ((0, 0), (-1, 0), (2, 0), (-1, -2), (2, 1))
+}
+NO_KICKS = ((0, 0),)
+
+
+def rotate_shape(shape):
+    """Поворот матрицы фигуры по часовой стрелке"""
+    return [list(row) for row in zip(*shape[::-1])]
+
+
+def trim_shape(shape):
+    """Обрезка пустых строк и столбцов: (матрица, смещение x, смещение y)"""
+    rows = [y for y, row in enumerate(shape) if any(row)]
+    columns = [x for x in range(len(shape[0])) if any(row[x] for row in shape)]
+    return [list(shape[y][columns[0]:columns[-1] + 1]) for y in rows], columns[0], rows[0]
+
+
+def srs_box(shape_idx, shape):
+    """Фигура в квадрате поворота SRS (I - 4x4 во второй строке, O - 2x2, остальные - 3x3)"""
+    size = max(len(shape), len(shape[0]))
+    box = [[0] * size for _ in range(size)]
+    top = 1 if shape_idx == I_PIECE else 0
+    for y, row in enumerate(shape):
+        box[top + y][:len(row)] = row
+    return box
+
+
+def build_rotations(shapes):
+    """Четыре готовых поворота каждой фигуры и положение каждого в квадрате поворота.
+
+    Поворачивается весь квадрат SRS, а хранится обрезанная фигура, поэтому
+    при смене поворота левый верхний угол сдвигается на разницу смещений.
+    """
+    rotations = []
+    offsets = []
+    for shape_idx, shape in enumerate(shapes):
+        box = srs_box(shape_idx, shape)
+        orientations = []
+        shape_offsets = []
+        for _ in range(4):
+            trimmed, offset_x, offset_y = trim_shape(box)
+            orientations.append(orientation_of(trimmed))
+            shape_offsets.append((offset_x, offset_y))
+            box = rotate_shape(box)
+        rotations.append(tuple(orientations))
+        offsets.append(tuple(shape_offsets))
+    return tuple(rotations), tuple(offsets)
+
+
+def build_kicks(shapes, offsets):
+    """Сдвиги левого верхнего угла при повороте: kicks[фигура][из][в] = ((dx, dy), ...)"""
+    kicks = []
+    for shape_idx in range(len(shapes)):
+        table = KICKS_I if shape_idx == I_PIECE else KICKS_JLSTZ
+        shape_kicks = []
+        for start in range(4):
+            start_x, start_y = offsets[shape_idx][start]
+            row = []
+            for end in range(4):
+                end_x, end_y = offsets[shape_idx][end]
+                tests = NO_KICKS if shape_idx == O_PIECE else table.get((start, end), NO_KICKS)
+                row.append(tuple((dx + end_x - start_x, dy + end_y - start_y) for dx, dy in tests))
+            shape_kicks.append(tuple(row))
+        kicks.append(tuple(shape_kicks))
+    return tuple(kicks)
+
+
+ROTATIONS, ROTATION_OFFSETS = build_rotations(SHAPES)
+KICKS = build_kicks(SHAPES, ROTATION_OFFSETS)
+
+
+class Tetromino:
+    def __init__(self, shape_idx, width=GRID_WIDTH):
+        self.shape_idx = shape_idx
+        self.rotation = 0
+        self.orientation = ROTATIONS[shape_idx][0]
+        self.x = width // 2 - len(self.shape[0]) // 2
+        self.y = 0
+
+    @property
+    def shape(self):
+        return self.orientation.shape
+
+    def rotate(self):
+        """Матрица следующего поворота по часовой стрелке (готовая, без вычислений)"""
+        return ROTATIONS[self.shape_idx][(self.rotation + 1) % 4].shape
+
+
+class TetrisEngine:
+    """Состояние одной партии и все правила игры.
+
+    board_class - хранилище поля (BitBoard или ListBoard, см. tetris_board.py).
+    """
+
+    def __init__(self, seed=None, width=GRID_WIDTH, height=GRID_HEIGHT, board_class=BitBoard):
+        self.width = width
+        self.height = height
+        self.board_class = board_class
+        self.random = random.Random(seed)
+        # Растет при каждом изменении поля (для перерисовки только по изменению)
+        self.version = 0
+        self.reset()
+
+    def reset(self, seed=None):
+        """Новая партия (seed задает последовательность фигур)"""
+        if seed is not None:
+            self.random.seed(seed)
+        self.board = self.board_class(self.width, self.height)
+        self.version += 1
+        self.current_piece = self.new_piece()
+        self.next_piece = self.new_piece()
+        self.game_over = False
+        self.score = 0
+        self.level = 1
+        self.lines_cleared = 0
+        self.pieces = 0
+        self.fall_speed = 0.5
+        self.fall_time = 0
+
+    def new_piece(self):
+        return Tetromino(self.random.randrange(len(SHAPES)), self.width)
+
+    def check_collision(self, shape, x, y):
+        return not self.board.fits(orientation_of(shape), x, y)
+
+    def merge_piece(self):
+        piece = self.current_piece
+        self.board.place(piece.orientation, piece.x, piece.y, piece.shape_idx + 1)
+
+    def clear_lines(self):
+        """Удаление заполненных линий, возвращает их число"""
+        cleared = self.board.clear_lines()
+        if cleared:
+            self.lines_cleared += cleared
+            self.score += LINE_SCORES[min(cleared, 4) - 1] * 100 * self.level
+            self.level = self.lines_cleared // 10 + 1
+            self.fall_speed = max(0.1, 0.5 - (self.level - 1) * 0.05)
+        return cleared
+
+    def move(self, dx, dy=0):
+        """Сдвиг текущей фигуры, если есть место"""
+        piece = self.current_piece
+        if self.game_over or not self.board.fits(piece.orientation, piece.x + dx, piece.y + dy):
+            return False
+        piece.x += dx
+        piece.y += dy
+        return True
+
+    def rotate(self, direction=1):
+        """Поворот текущей фигуры (1 - по часовой, -1 - против).
+
+        Фигура поворачивается вокруг центра квадрата SRS; если там не
+        помещается, по очереди пробуются смещения из таблиц SRS.
+        """
+        piece = self.current_piece
+        if self.game_over:
+            return False
+        rotation = (piece.rotation + direction) % 4
+        orientation = ROTATIONS[piece.shape_idx][rotation]
+        fits = self.board.fits
+        # Часть фигуры может оказаться выше поля (так I поворачивается на месте сразу
+        # после появления): fits и place клетки над полем пропускают
+        for dx, dy in KICKS[piece.shape_idx][piece.rotation][rotation]:
+            if fits(orientation, piece.x + dx, piece.y + dy):
+                piece.x += dx
+                piece.y += dy
+                piece.rotation = rotation
+                piece.orientation = orientation
+                return True
+        return False
+
+    def landing_y(self):
+        """Строка, на которой остановится текущая фигура при сбросе (для тени)"""
+        piece = self.current_piece
+        fits = self.board.fits
+        y = piece.y
+        while fits(piece.orientation, piece.x, y + 1):
+            y += 1
+        return y
+
+    def drop(self, lock=True):
+        """Сброс фигуры вниз до упора; lock - сразу закрепить ее.
+
+        Возвращает, на сколько строк фигура опустилась.
+        """
+        distance = 0
+        while self.move(0, 1):
+            distance += 1
+        if lock and not self.game_over:
+            self.lock_piece()
+        return distance
+
+    def lock_piece(self):
+        """Закрепление фигуры, очистка линий и выпуск следующей"""
+        self.merge_piece()
+        cleared = self.clear_lines()
+        self.pieces += 1
+        self.version += 1
+
+        self.current_piece = self.next_piece
+        self.next_piece = self.new_piece()
+        piece = self.current_piece
+        if not self.board.fits(piece.orientation, piece.x, piece.y):
+            self.game_over = True
+        return cleared
+
+    def tick(self):
+        """Один шаг гравитации: фигура опускается или закрепляется"""
+        if self.game_over:
+            return
+        if not self.move(0, 1):
+            self.lock_piece()
+
+    def step(self, dt):
+        """Продвижение времени на dt секунд"""
+        if self.game_over:
+            return
+        self.fall_time += dt
+        if self.fall_time >= self.fall_speed:
+            self.fall_time = 0
+            self.tick()
+
+    # Действия по именам - для ботов и повтора записанных партий
+    ACTIONS = {
+        'left': lambda engine: engine.move(-1),
+        'right': lambda engine: engine.move(1),
+        'down': lambda engine: engine.move(0, 1),
+        'rotate': lambda engine: engine.rotate(),
+        'rotate_ccw': lambda engine: engine.rotate(-1),
+        'drop': lambda engine: engine.drop(),
+        'tick': lambda engine: engine.tick()
+    }
+
+    def apply(self, action):
+        return self.ACTIONS[action](self)
+
+
+def replay(seed, actions):
+    """Повтор партии по seed и списку действий (проверка заявленного счета)"""
+    engine = TetrisEngine(seed)
+    for action in actions:
+        if engine.game_over:
+            break
+        engine.apply(action)
+    return engine
+
+
+def simulate(pieces, seed=None, engine=None):
+    """Случайная игра на pieces фигур (после проигрыша партия начинается заново)"""
+    engine = engine or TetrisEngine(seed)
+    rng = random.Random(seed)
+    games = 1
+    placed = 0
+    while placed < pieces:
+        if engine.game_over:
+            engine.reset()
+            games += 1
+        for _ in range(rng.randrange(4)):
+            engine.rotate()
+        dx = rng.randint(-5, 5)
+        step = 1 if dx > 0 else -1
+        for _ in range(abs(dx)):
+            if not engine.move(step):
+                break
+        engine.drop()
+        placed += 1
+    return games
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Скорость движка Тетриса без графики")
+    parser.add_argument("--pieces", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--board", choices=("bit", "list"), default="bit", help="хранилище поля")
+    args = parser.parse_args(argv)
+
+    engine = TetrisEngine(args.seed, board_class=BitBoard if args.board == "bit" else ListBoard)
+    start = time.perf_counter()
+    games = simulate(args.pieces, args.seed, engine)
+    elapsed = time.perf_counter() - start
+    print(f"{args.pieces} фигур, {games} партий за {elapsed:.2f} с: {args.pieces / elapsed:,.0f} фигур/с")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
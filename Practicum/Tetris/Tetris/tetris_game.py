@@ -2,7 +2,15 @@ import pygame
 import random
 import mysql.connector
 from datetime import datetime
+import os
 import sys
+import json
+import uuid
+import queue
+import threading
+from collections import OrderedDict
+
+from tetris_core import TetrisEngine, SHAPES, GRID_WIDTH, GRID_HEIGHT
 
 # Конфигурация MySQL
 DB_CONFIG = {
@@ -12,15 +20,13 @@ DB_CONFIG = {
     'database': 'tetris_db'
 }
 
-# Инициализация PyGame
-pygame.init()
+# Журнал результатов, еще не подтвержденных базой
+SCORE_JOURNAL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "score_journal.jsonl")
 
 # Константы
 SCREEN_WIDTH = 900
 SCREEN_HEIGHT = 750
 GRID_SIZE = 30
-GRID_WIDTH = 10
-GRID_HEIGHT = 20
 SIDEBAR_WIDTH = 300
 
 # Цвета
@@ -32,6 +38,8 @@ TEXT_COLOR = (240, 240, 245)
 DARK_CARD = (30, 30, 45)
 LIGHT_CARD = (40, 40, 55)
 GRID_BG = (25, 25, 35)
+# Прозрачный цвет вспомогательных слоев
+COLORKEY = (255, 0, 255)
 
 # Цвета фигур
 COLORS = [
@@ -44,16 +52,49 @@ COLORS = [
     (255, 50, 50)     # Z
 ]
 
-# Фигуры Тетриса
-SHAPES = [
-    [[1, 1, 1, 1]],
-    [[1, 0, 0], [1, 1, 1]],
-    [[0, 0, 1], [1, 1, 1]],
-    [[1, 1], [1, 1]],
-    [[0, 1, 1], [1, 1, 0]],
-    [[0, 1, 0], [1, 1, 1]],
-    [[1, 1, 0], [0, 1, 1]]
-]
+class TextCache:
+    """Единый реестр шрифтов и LRU готовых поверхностей текста.
+
+    Повторный вывод той же строки тем же шрифтом и цветом - один blit
+    без font.render.
+    """
+    
+    # имя -> (семейство, размер, жирный)
+    FONTS = {
+        "title": ('Arial', 64, True),
+        "big": ('Arial', 40, True),
+        "button": ('Arial', 28, True),
+        "normal": ('Arial', 28, False),
+        "small": ('Arial', 22, False),
+    }
+    
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.fonts = {}
+        # (шрифт, текст, цвет, сглаживание) -> Surface
+        self.surfaces = OrderedDict()
+        
+    def font(self, name):
+        """Шрифт из реестра (создается один раз, после pygame.init)"""
+        font = self.fonts.get(name)
+        if font is None:
+            family, size, bold = self.FONTS[name]
+            font = self.fonts[name] = pygame.font.SysFont(family, size, bold=bold)
+        return font
+        
+    def render(self, font, text, antialias, color):
+        """Как font.render, но шрифт задается именем из реестра"""
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        
+        surface = self.surfaces[key] = self.font(font).render(text, antialias, color)
+        while len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
 
 class Button:
     def __init__(self, x, y, width, height, text, color=PRIMARY, hover_color=(0, 180, 200)):
@@ -62,16 +103,15 @@ class Button:
         self.color = color
         self.hover_color = hover_color
         self.current_color = color
-        self.font = pygame.font.SysFont('Arial', 28, bold=True)
         self.hovered = False
         
-    def draw(self, surface):
+    def draw(self, surface, text_cache):
         # Рисуем кнопку с скругленными углами
         pygame.draw.rect(surface, self.current_color, self.rect, border_radius=12)
         pygame.draw.rect(surface, (255, 255, 255), self.rect, 2, border_radius=12)
         
         # Текст
-        text_surf = self.font.render(self.text, True, TEXT_COLOR)
+        text_surf = text_cache.render("button", self.text, True, TEXT_COLOR)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
         
@@ -85,44 +125,442 @@ class Button:
             return self.rect.collidepoint(pos)
         return False
 
-class Tetromino:
+class TileAtlas:
+    """Плитки блоков, нарисованные один раз: по одной на цвет, размер и вариант"""
+    
+    # размер -> (сторона, скругление углов, обводка)
+    SIZES = {
+        "board": (GRID_SIZE - 2, 3, True),
+        "preview": (GRID_SIZE - 2, 4, True),
+        "background": (18, 0, False),
+    }
+    # normal - обычный блок, ghost - полупрозрачный контур (тень фигуры)
+    VARIANTS = ("normal", "ghost")
+    
     def __init__(self):
-        self.shape_idx = random.randint(0, len(SHAPES) - 1)
-        self.shape = SHAPES[self.shape_idx]
-        self.color = COLORS[self.shape_idx]
-        self.x = GRID_WIDTH // 2 - len(self.shape[0]) // 2
-        self.y = 0
+        # convert() требует уже созданного окна
+        self.tiles = {}
+        for size in self.SIZES:
+            for color_idx in range(len(COLORS)):
+                for variant in self.VARIANTS:
+                    self.tiles[size, color_idx, variant] = self.render(size, color_idx, variant)
+        
+    def render(self, size, color_idx, variant):
+        side, radius, outline = self.SIZES[size]
+        color = COLORS[color_idx]
+        
+        tile = pygame.Surface((side, side))
+        tile.fill(COLORKEY)
+        rect = tile.get_rect()
+        if variant == "ghost":
+            pygame.draw.rect(tile, color, rect, 2, border_radius=radius)
+        else:
+            pygame.draw.rect(tile, color, rect, border_radius=radius)
+            if outline:
+                pygame.draw.rect(tile, TEXT_COLOR, rect, 1, border_radius=radius)
+        
+        # Формат экрана - blit без преобразования пикселей; углы прозрачны по цветовому ключу
+        tile = tile.convert()
+        tile.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        if variant == "ghost":
+            tile.set_alpha(120)
+        return tile
+        
+    def get(self, color_idx, size="board", variant="normal"):
+        return self.tiles[size, color_idx, variant]
+        
+    def shape_blits(self, shape, color_idx, x, y, step, size="board", variant="normal"):
+        """Пары (плитка, позиция) для Surface.blits: блоки матрицы shape с левым верхним углом в (x, y)"""
+        tile = self.tiles[size, color_idx, variant]
+        return [(tile, (x + sx * step, y + sy * step))
+                for sy, row in enumerate(shape) for sx, cell in enumerate(row) if cell]
+    
+
+class GameScreenRenderer:
+    """Экран игры слоями: неизменная часть и поле рисуются заранее,
+    на экран за кадр попадают только изменившиеся прямоугольники"""
+    
+    STATS_X = SCREEN_WIDTH - SIDEBAR_WIDTH + 60
+    STATS_Y = 80
+    STAT_LABELS = ["ИГРОК:", "СЧЕТ:", "УРОВЕНЬ:", "ЛИНИИ:", "СКОРОСТЬ:"]
+    GRID_LINE_COLOR = (40, 40, 55)
+    
+    def __init__(self, game):
+        self.game = game
+        self.screen = game.screen
+        self.screen_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        # Поле вместе с последней линией сетки
+        self.grid_rect = pygame.Rect(50, 50, GRID_WIDTH * GRID_SIZE + 1, GRID_HEIGHT * GRID_SIZE + 1)
+        # Следующая фигура и кнопки под ней
+        self.next_text_y = self.STATS_Y + len(self.STAT_LABELS) * 55 + 20
+        self.next_piece_y = self.next_text_y + 40
+        self.sidebar_rect = pygame.Rect(SCREEN_WIDTH - SIDEBAR_WIDTH, self.next_piece_y - 10,
+                                        SIDEBAR_WIDTH, SCREEN_HEIGHT - self.next_piece_y + 10)
+        self.background = None
+        self.frame_key = None
+        self.hover = None
+        self.invalidate()
+        
+    def invalidate(self):
+        """Перерисовать весь экран на следующем кадре"""
+        self.full = True
+        
+    def build_layers(self):
+        # Фон, карточки, подписи - не меняются за всю игру
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        surface = self.background
+        surface.fill(BACKGROUND)
+        
+        game_rect = pygame.Rect(40, 40, GRID_WIDTH * GRID_SIZE + 20, GRID_HEIGHT * GRID_SIZE + 20)
+        pygame.draw.rect(surface, DARK_CARD, game_rect, border_radius=15)
+        pygame.draw.rect(surface, PRIMARY, game_rect, 3, border_radius=15)
+        pygame.draw.rect(surface, GRID_BG, (50, 50, GRID_WIDTH * GRID_SIZE, GRID_HEIGHT * GRID_SIZE))
+        
+        sidebar_rect = pygame.Rect(SCREEN_WIDTH - SIDEBAR_WIDTH + 20, 40,
+                                   SIDEBAR_WIDTH - 40, GRID_HEIGHT * GRID_SIZE + 20)
+        pygame.draw.rect(surface, DARK_CARD, sidebar_rect, border_radius=15)
+        pygame.draw.rect(surface, PRIMARY, sidebar_rect, 3, border_radius=15)
+        
+        for i, label in enumerate(self.STAT_LABELS):
+            label_text = self.game.text.render("small", label, True, (150, 150, 170))
+            surface.blit(label_text, (self.STATS_X, self.STATS_Y + i * 55))
+        next_text = self.game.text.render("normal", "СЛЕДУЮЩАЯ:", True, PRIMARY)
+        surface.blit(next_text, (self.STATS_X, self.next_text_y))
+        
+        # Сетка - отдельным слоем с прозрачным фоном, кладется поверх падающей фигуры
+        self.grid_lines = pygame.Surface(self.grid_rect.size)
+        self.grid_lines.fill(COLORKEY)
+        self.grid_lines.set_colorkey(COLORKEY)
+        for x in range(GRID_WIDTH + 1):
+            pygame.draw.line(self.grid_lines, self.GRID_LINE_COLOR,
+                             (x * GRID_SIZE, 0), (x * GRID_SIZE, GRID_HEIGHT * GRID_SIZE), 1)
+        for y in range(GRID_HEIGHT + 1):
+            pygame.draw.line(self.grid_lines, self.GRID_LINE_COLOR,
+                             (0, y * GRID_SIZE), (GRID_WIDTH * GRID_SIZE, y * GRID_SIZE), 1)
+        
+        # Фон вместе с лежащими блоками - из него восстанавливается все, что стерто
+        self.base = self.background.copy()
+        self.version = None
+        
+    def render_board(self):
+        # Лежащие блоки меняются только при закреплении фигуры и новой игре
+        base = self.base
+        base.blit(self.background, self.grid_rect, self.grid_rect)
+        tiles = [self.game.tiles.get(color_idx) for color_idx in range(len(COLORS))]
+        board = self.game.engine.board.grid
+        base.blits([(tiles[value - 1], (51 + x * GRID_SIZE, 51 + y * GRID_SIZE))
+                    for y, row in enumerate(board)
+                    for x, value in enumerate(row) if value], False)
+        base.blit(self.grid_lines, self.grid_rect)
+        
+    def restore(self, rect):
+        """Вернуть участок экрана из фонового слоя"""
+        self.screen.blit(self.base, rect, rect)
+        
+    def draw_piece(self, piece):
+        """Фигура и ее тень на месте приземления, возвращает занятый ими прямоугольник"""
+        shape = piece.shape
+        tiles = self.game.tiles
+        x = 51 + piece.x * GRID_SIZE
+        landing_y = self.game.engine.landing_y()
+        piece_rect = pygame.Rect(x - 1, 50 + piece.y * GRID_SIZE, len(shape[0]) * GRID_SIZE + 1,
+                                 (landing_y - piece.y + len(shape)) * GRID_SIZE + 1)
+        # После поворота у верхнего края часть фигуры бывает выше поля - ее не видно
+        piece_rect = piece_rect.clip(self.grid_rect)
+        blits = []
+        if landing_y != piece.y:
+            blits = tiles.shape_blits(shape, piece.shape_idx, x, 51 + landing_y * GRID_SIZE,
+                                      GRID_SIZE, variant="ghost")
+        blits += tiles.shape_blits(shape, piece.shape_idx, x, 51 + piece.y * GRID_SIZE, GRID_SIZE)
+        self.screen.set_clip(piece_rect)
+        self.screen.blits(blits, False)
+        self.screen.set_clip(None)
+        
+        # Сетка поверх фигуры - как при полной отрисовке
+        self.screen.blit(self.grid_lines, piece_rect,
+                         piece_rect.move(-self.grid_rect.x, -self.grid_rect.y))
+        return piece_rect
+        
+    def draw_sidebar_bottom(self):
+        # Следующая фигура по центру
+        next_piece = self.game.engine.next_piece
+        shape_width = len(next_piece.shape[0]) * GRID_SIZE
+        next_piece_x = self.STATS_X + (SIDEBAR_WIDTH - 120 - shape_width) // 2
+        
+        preview_bg_height = len(next_piece.shape) * GRID_SIZE + 20
+        preview_bg_rect = pygame.Rect(next_piece_x - 10, self.next_piece_y - 10,
+                                      max(shape_width, 100) + 20, preview_bg_height)
+        pygame.draw.rect(self.screen, LIGHT_CARD, preview_bg_rect, border_radius=10)
+        pygame.draw.rect(self.screen, PRIMARY, preview_bg_rect, 2, border_radius=10)
+        
+        self.screen.blits(self.game.tiles.shape_blits(next_piece.shape, next_piece.shape_idx,
+                                                      next_piece_x, self.next_piece_y,
+                                                      GRID_SIZE, size="preview"), False)
+        
+        # Кнопки сразу под превью
+        buttons = self.game.buttons
+        button_start_y = self.next_piece_y + preview_bg_height + 40
+        buttons[0].rect.y = button_start_y
+        buttons[1].rect.y = button_start_y + 70
+        for button in buttons:
+            button.draw(self.screen, self.game.text)
+        
+    def draw_game_over(self):
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        overlay.set_alpha(180)
+        overlay.fill(BACKGROUND)
+        self.screen.blit(overlay, (0, 0))
+        
+        game_over_text = self.game.text.render("big", "ИГРА ОКОНЧЕНА!", True, ACCENT)
+        score_text = self.game.text.render("normal", f"Ваш счет: {self.game.engine.score}", True, TEXT_COLOR)
+        self.screen.blit(game_over_text, (SCREEN_WIDTH//2 - game_over_text.get_width()//2, 300))
+        self.screen.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, 370))
+        
+    def draw(self):
+        """Отрисовать кадр, вернуть список изменившихся прямоугольников экрана"""
+        game = self.game
+        engine = game.engine
+        if self.background is None:
+            self.build_layers()
+        
+        hover = [button.current_color for button in game.buttons]
+        frame_key = (game.buttons, engine.game_over)
+        if frame_key != self.frame_key:
+            self.full = True
+        elif engine.game_over:
+            # Под затемнением меняется только подсветка кнопок - затемнение рисуется заново
+            if hover == self.hover and not self.full:
+                return []
+            self.full = True
+        self.frame_key = frame_key
+        
+        full = self.full
+        if full:
+            self.screen.blit(self.base, (0, 0))
+            self.piece_key = self.piece_rect = None
+            self.stat_values = [None] * len(self.STAT_LABELS)
+            self.stat_rects = [None] * len(self.STAT_LABELS)
+            self.sidebar_key = None
+            self.full = False
+        dirty = []
+        
+        # Лежащие блоки: слой перестраивается только при изменении поля
+        if engine.version != self.version:
+            self.version = engine.version
+            self.render_board()
+            self.restore(self.grid_rect)
+            dirty.append(self.grid_rect)
+            self.piece_key = self.piece_rect = None
+        
+        # Падающая фигура: стираем старое место, рисуем на новом
+        piece = engine.current_piece
+        piece_key = (piece, piece.orientation, piece.x, piece.y)
+        if piece_key != self.piece_key:
+            if self.piece_rect:
+                self.restore(self.piece_rect)
+                dirty.append(self.piece_rect)
+            self.piece_rect = self.draw_piece(piece)
+            self.piece_key = piece_key
+            dirty.append(self.piece_rect)
+        
+        # Значения статистики - только изменившиеся
+        values = [game.player_name, str(engine.score), str(engine.level),
+                  str(engine.lines_cleared), f"{engine.fall_speed:.1f}"]
+        for i, value in enumerate(values):
+            if value != self.stat_values[i]:
+                if self.stat_rects[i]:
+                    self.restore(self.stat_rects[i])
+                    dirty.append(self.stat_rects[i])
+                value_text = game.text.render("normal", value, True, TEXT_COLOR)
+                self.stat_rects[i] = self.screen.blit(value_text, (self.STATS_X, self.STATS_Y + i * 55 + 25))
+                self.stat_values[i] = value
+                dirty.append(self.stat_rects[i])
+        
+        # Следующая фигура и кнопки
+        sidebar_key = (engine.next_piece, hover)
+        if sidebar_key != self.sidebar_key:
+            self.restore(self.sidebar_rect)
+            self.draw_sidebar_bottom()
+            self.sidebar_key = sidebar_key
+            dirty.append(self.sidebar_rect)
+        self.hover = hover
+        
+        if engine.game_over:
+            self.draw_game_over()
+        if full:
+            return [self.screen_rect]
+        return dirty
+    
 
-    def rotate(self):
-        rotated = list(zip(*self.shape[::-1]))
-        return [list(row) for row in rotated]
+class Leaderboard:
+    """Таблица лидеров в памяти.
+
+    Запрос к базе идет в фоновом потоке: при входе на экран лидеров, по
+    таймеру, пока экран открыт, и после сохранения нового результата.
+    Отрисовка только читает готовый список.
+    """
+    
+    def __init__(self, load, refresh_interval=30.0):
+        # load() -> список строк или None при ошибке (прежний список остается)
+        self.load = load
+        self.refresh_interval = refresh_interval
+        self.lock = threading.Lock()
+        self.scores = []
+        self.loaded = False
+        self.active = False
+        self.stopped = False
+        self.wake = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="leaderboard", daemon=True)
+        self.thread.start()
+        
+    def open(self):
+        """Экран лидеров открыт: сразу обновить и дальше обновлять по таймеру"""
+        self.active = True
+        self.wake.set()
+        
+    def close(self):
+        self.active = False
+        
+    def invalidate(self):
+        """Данные в базе изменились - перечитать в фоне"""
+        self.wake.set()
+        
+    def snapshot(self):
+        """(строки таблицы, был ли уже запрос к базе) - без обращения к базе"""
+        with self.lock:
+            return self.scores, self.loaded
+        
+    def stop(self):
+        self.stopped = True
+        self.wake.set()
+        
+    def _run(self):
+        while True:
+            # Экран закрыт - ждем только явного запроса
+            self.wake.wait(self.refresh_interval if self.active else None)
+            self.wake.clear()
+            if self.stopped:
+                return
+            scores = self.load()
+            with self.lock:
+                if scores is not None:
+                    self.scores = scores
+                self.loaded = True
+    
+
+class ScoreWriter:
+    """Сохранение результатов в фоне.
+
+    Результат сначала дописывается в локальный журнал (JSON по строке),
+    затем поток пишет его в базу, повторяя попытки с растущей паузой.
+    После успешной записи в журнал добавляется отметка {"id": ..., "done": true}.
+    Неподтвержденные результаты при следующем запуске отправляются заново.
+    """
+    
+    def __init__(self, insert, journal_path=SCORE_JOURNAL, on_saved=None,
+                 retry_delay=1.0, max_retry_delay=60.0):
+        # insert(record) -> True, если результат записан в базу
+        self.insert = insert
+        self.journal_path = journal_path
+        self.on_saved = on_saved
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.journal_lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.stopped = threading.Event()
+        
+        for record in self.replay():
+            self.queue.put(record)
+        self.thread = threading.Thread(target=self._run, name="score-writer", daemon=True)
+        self.thread.start()
+        
+    def replay(self):
+        """Неподтвержденные записи журнала; журнал сжимается до них"""
+        if not os.path.exists(self.journal_path):
+            return []
+        pending = {}
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Строка, оборванная при аварийном завершении
+                if record.get("done"):
+                    pending.pop(record["id"], None)
+                else:
+                    pending[record["id"]] = record
+        
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in pending.values():
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.journal_path)
+        return list(pending.values())
+        
+    def append(self, record):
+        with self.journal_lock:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        
+    def submit(self, player_name, score, level, lines_cleared):
+        """Поставить результат в очередь (не ждет базу)"""
+        record = {
+            "id": uuid.uuid4().hex,
+            "player_name": player_name,
+            "score": score,
+            "level": level,
+            "lines_cleared": lines_cleared,
+        }
+        self.append(record)
+        self.queue.put(record)
+        return record
+        
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            delay = self.retry_delay
+            while not self.insert(record):
+                # При остановке запись остается в журнале до следующего запуска
+                if self.stopped.wait(delay):
+                    return
+                delay = min(delay * 2, self.max_retry_delay)
+            self.append({"id": record["id"], "done": True})
+            if self.on_saved:
+                self.on_saved()
+        
+    def stop(self, timeout=2.0):
+        """Дописать очередь, если база отвечает; не ждать дольше timeout"""
+        self.queue.put(None)
+        self.thread.join(timeout)
+        self.stopped.set()
+    
 
 class TetrisGame:
     def __init__(self):
+        # Инициализация PyGame
+        pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Modern Tetris")
         self.clock = pygame.time.Clock()
+        self.tiles = TileAtlas()
+        
+        # Шрифты и готовые надписи - один кэш на все экраны и кнопки
+        self.text = TextCache()
         
-        # Шрифты
-        self.title_font = pygame.font.SysFont('Arial', 64, bold=True)
-        self.big_font = pygame.font.SysFont('Arial', 40, bold=True)
-        self.normal_font = pygame.font.SysFont('Arial', 28)
-        self.small_font = pygame.font.SysFont('Arial', 22)
+        # Правила игры (поле, фигуры, очки) - в движке без pygame
+        self.engine = TetrisEngine()
+        self.renderer = GameScreenRenderer(self)
+        self.leaderboard = Leaderboard(self.get_high_scores)
+        self.score_writer = ScoreWriter(self.insert_score, on_saved=self.leaderboard.invalidate)
         
         # Состояния игры
         self.state = "menu"  # menu, enter_name, game, leaders
         self.reset_game()
         
     def reset_game(self):
-        self.board = [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-        self.current_piece = Tetromino()
-        self.next_piece = Tetromino()
-        self.game_over = False
-        self.score = 0
-        self.level = 1
-        self.lines_cleared = 0
-        self.fall_speed = 0.5
-        self.fall_time = 0
+        self.engine.reset()
         self.player_name = ""
         
     def create_buttons(self):
@@ -156,42 +594,37 @@ class TetrisGame:
         self.draw_background_shapes()
         
         # Заголовок
-        title = self.title_font.render("TETRIS", True, PRIMARY)
-        title_shadow = self.title_font.render("TETRIS", True, (0, 150, 170))
+        title = self.text.render("title", "TETRIS", True, PRIMARY)
+        title_shadow = self.text.render("title", "TETRIS", True, (0, 150, 170))
         self.screen.blit(title_shadow, (SCREEN_WIDTH//2 - title.get_width()//2 + 4, 154))
         self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 150))
         
-        subtitle = self.normal_font.render("Modern Edition", True, TEXT_COLOR)
+        subtitle = self.text.render("normal", "Modern Edition", True, TEXT_COLOR)
         self.screen.blit(subtitle, (SCREEN_WIDTH//2 - subtitle.get_width()//2, 230))
         
         # Кнопки
         for button in self.buttons:
-            button.draw(self.screen)
+            button.draw(self.screen, self.text)
             
         # Информация внизу
-        info_text = self.small_font.render("Управление: ← → ↑ ↓, Пробел - сбросить, ESC - выход", True, (150, 150, 170))
+        info_text = self.text.render("small", "Управление: ← → ↑ ↓, Пробел - сбросить, ESC - выход", True, (150, 150, 170))
         self.screen.blit(info_text, (SCREEN_WIDTH//2 - info_text.get_width()//2, 680))
     
     def draw_background_shapes(self):
-        # Рисуем случайные фигуры на фоне
+        # Рисуем случайные фигуры на фоне - одним пакетом готовых плиток
+        blits = []
         for i in range(15):
             shape_idx = random.randint(0, len(SHAPES) - 1)
-            shape = SHAPES[shape_idx]
-            color = (*COLORS[shape_idx], 30)  # Прозрачный цвет
             x = random.randint(0, SCREEN_WIDTH)
             y = random.randint(0, SCREEN_HEIGHT)
-            
-            for sy, row in enumerate(shape):
-                for sx, cell in enumerate(row):
-                    if cell:
-                        rect = pygame.Rect(x + sx * 20, y + sy * 20, 18, 18)
-                        pygame.draw.rect(self.screen, color[:3], rect)
+            blits += self.tiles.shape_blits(SHAPES[shape_idx], shape_idx, x, y, 20, size="background")
+        self.screen.blits(blits, False)
     
     def draw_enter_name(self):
         self.screen.fill(BACKGROUND)
         
         # Заголовок
-        title = self.big_font.render("ВВЕДИТЕ ВАШЕ ИМЯ", True, PRIMARY)
+        title = self.text.render("big", "ВВЕДИТЕ ВАШЕ ИМЯ", True, PRIMARY)
         self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 200))
         
         # Поле ввода
@@ -200,153 +633,31 @@ class TetrisGame:
         pygame.draw.rect(self.screen, PRIMARY, input_rect, 3, border_radius=15)
         
         # Текст имени
-        name_text = self.normal_font.render(self.player_name + ("|" if pygame.time.get_ticks() % 1000 < 500 else ""), 
+        name_text = self.text.render("normal", self.player_name + ("|" if pygame.time.get_ticks() % 1000 < 500 else ""), 
                                           True, TEXT_COLOR)
         self.screen.blit(name_text, (SCREEN_WIDTH//2 - name_text.get_width()//2, 325))
         
         # Кнопки
         for button in self.buttons:
-            button.draw(self.screen)
+            button.draw(self.screen, self.text)
             
         # Инструкция
-        inst_text = self.small_font.render("Имя может содержать только буквы и цифры", True, (150, 150, 170))
+        inst_text = self.text.render("small", "Имя может содержать только буквы и цифры", True, (150, 150, 170))
         self.screen.blit(inst_text, (SCREEN_WIDTH//2 - inst_text.get_width()//2, 480))
     
     def draw_game(self):
-        self.screen.fill(BACKGROUND)
-        
-        # Основной контейнер игры
-        game_rect = pygame.Rect(40, 40, GRID_WIDTH * GRID_SIZE + 20, GRID_HEIGHT * GRID_SIZE + 20)
-        pygame.draw.rect(self.screen, DARK_CARD, game_rect, border_radius=15)
-        pygame.draw.rect(self.screen, PRIMARY, game_rect, 3, border_radius=15)
-        
-        # Игровое поле
-        self.draw_grid()
-        
-        # Боковая панель
-        sidebar_rect = pygame.Rect(SCREEN_WIDTH - SIDEBAR_WIDTH + 20, 40, 
-                                 SIDEBAR_WIDTH - 40, GRID_HEIGHT * GRID_SIZE + 20)
-        pygame.draw.rect(self.screen, DARK_CARD, sidebar_rect, border_radius=15)
-        pygame.draw.rect(self.screen, PRIMARY, sidebar_rect, 3, border_radius=15)
-        
-        # Статистика
-        stats_y = 80
-        stats = [
-            ("ИГРОК:", self.player_name),
-            ("СЧЕТ:", str(self.score)),
-            ("УРОВЕНЬ:", str(self.level)),
-            ("ЛИНИИ:", str(self.lines_cleared)),
-            ("СКОРОСТЬ:", f"{self.fall_speed:.1f}")
-        ]
-        
-        for i, (label, value) in enumerate(stats):
-            label_text = self.small_font.render(label, True, (150, 150, 170))
-            value_text = self.normal_font.render(value, True, TEXT_COLOR)
-            self.screen.blit(label_text, (SCREEN_WIDTH - SIDEBAR_WIDTH + 60, stats_y + i * 55))
-            self.screen.blit(value_text, (SCREEN_WIDTH - SIDEBAR_WIDTH + 60, stats_y + i * 55 + 25))
-        
-        # Следующая фигура - ПЕРЕМЕЩЕНА НИЖЕ
-        next_text_y = stats_y + len(stats) * 55 + 20  # Добавляем отступ после статистики
-        next_text = self.normal_font.render("СЛЕДУЮЩАЯ:", True, PRIMARY)
-        self.screen.blit(next_text, (SCREEN_WIDTH - SIDEBAR_WIDTH + 60, next_text_y))
-        
-        # Рисуем следующую фигуру - ПЕРЕМЕЩЕНА ЕЩЕ НИЖЕ
-        next_piece_y = next_text_y + 40  # Отступ после текста
-        # Центрируем следующую фигуру
-        shape_width = len(self.next_piece.shape[0]) * GRID_SIZE
-        next_piece_x = SCREEN_WIDTH - SIDEBAR_WIDTH + 60 + (SIDEBAR_WIDTH - 120 - shape_width) // 2
-        
-        # Рисуем фон для следующей фигуры
-        preview_bg_width = max(shape_width, 100) + 20
-        preview_bg_height = len(self.next_piece.shape) * GRID_SIZE + 20
-        preview_bg_rect = pygame.Rect(
-            next_piece_x - 10, 
-            next_piece_y - 10, 
-            preview_bg_width, 
-            preview_bg_height
-        )
-        pygame.draw.rect(self.screen, LIGHT_CARD, preview_bg_rect, border_radius=10)
-        pygame.draw.rect(self.screen, PRIMARY, preview_bg_rect, 2, border_radius=10)
-        
-        # Рисуем саму фигуру
-        for y, row in enumerate(self.next_piece.shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    rect = pygame.Rect(
-                        next_piece_x + x * GRID_SIZE,
-                        next_piece_y + y * GRID_SIZE,
-                        GRID_SIZE - 2, 
-                        GRID_SIZE - 2
-                    )
-                    pygame.draw.rect(self.screen, self.next_piece.color, rect, border_radius=4)
-                    pygame.draw.rect(self.screen, TEXT_COLOR, rect, 1, border_radius=4)
-        
-        # Кнопки - ПЕРЕМЕЩЕНЫ ЕЩЕ НИЖЕ
-        button_start_y = next_piece_y + preview_bg_height + 40
-        self.buttons[0].rect.y = button_start_y
-        self.buttons[1].rect.y = button_start_y + 70
-        
-        for button in self.buttons:
-            button.draw(self.screen)
-            
-        # Игра окончена
-        if self.game_over:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(180)
-            overlay.fill(BACKGROUND)
-            self.screen.blit(overlay, (0, 0))
-            
-            game_over_text = self.big_font.render("ИГРА ОКОНЧЕНА!", True, ACCENT)
-            score_text = self.normal_font.render(f"Ваш счет: {self.score}", True, TEXT_COLOR)
-            
-            self.screen.blit(game_over_text, (SCREEN_WIDTH//2 - game_over_text.get_width()//2, 300))
-            self.screen.blit(score_text, (SCREEN_WIDTH//2 - score_text.get_width()//2, 370))
-    
-    def draw_grid(self):
-        # Фон сетки
-        grid_bg = pygame.Rect(50, 50, GRID_WIDTH * GRID_SIZE, GRID_HEIGHT * GRID_SIZE)
-        pygame.draw.rect(self.screen, GRID_BG, grid_bg)
-        
-        # Заполненные клетки
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                if self.board[y][x]:
-                    color_idx = self.board[y][x] - 1
-                    color = COLORS[color_idx]
-                    rect = pygame.Rect(51 + x * GRID_SIZE, 51 + y * GRID_SIZE, 
-                                     GRID_SIZE - 2, GRID_SIZE - 2)
-                    pygame.draw.rect(self.screen, color, rect, border_radius=3)
-                    pygame.draw.rect(self.screen, TEXT_COLOR, rect, 1, border_radius=3)
-        
-        # Текущая фигура
-        for y, row in enumerate(self.current_piece.shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    rect = pygame.Rect(51 + (self.current_piece.x + x) * GRID_SIZE,
-                                    51 + (self.current_piece.y + y) * GRID_SIZE,
-                                    GRID_SIZE - 2, GRID_SIZE - 2)
-                    pygame.draw.rect(self.screen, self.current_piece.color, rect, border_radius=3)
-                    pygame.draw.rect(self.screen, TEXT_COLOR, rect, 1, border_radius=3)
-        
-        # Сетка
-        for x in range(GRID_WIDTH + 1):
-            pygame.draw.line(self.screen, (40, 40, 55), 
-                           (50 + x * GRID_SIZE, 50), 
-                           (50 + x * GRID_SIZE, 50 + GRID_HEIGHT * GRID_SIZE), 1)
-        for y in range(GRID_HEIGHT + 1):
-            pygame.draw.line(self.screen, (40, 40, 55), 
-                           (50, 50 + y * GRID_SIZE), 
-                           (50 + GRID_WIDTH * GRID_SIZE, 50 + y * GRID_SIZE), 1)
+        # Экран игры рисуется слоями, см. GameScreenRenderer
+        return self.renderer.draw()
     
     def draw_leaders(self):
         self.screen.fill(BACKGROUND)
         
         # Заголовок
-        title = self.big_font.render("ТАБЛИЦА ЛИДЕРОВ", True, PRIMARY)
+        title = self.text.render("big", "ТАБЛИЦА ЛИДЕРОВ", True, PRIMARY)
         self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 50))
         
-        # Получаем данные
-        scores = self.get_high_scores()
+        # Данные из памяти - база читается в фоне
+        scores, loaded = self.leaderboard.snapshot()
         
         # Контейнер таблицы
         table_rect = pygame.Rect(100, 150, SCREEN_WIDTH - 200, 450)
@@ -359,7 +670,7 @@ class TetrisGame:
         col_width = (SCREEN_WIDTH - 200) // len(headers)
         
         for i, header in enumerate(headers):
-            header_text = self.small_font.render(header, True, PRIMARY)
+            header_text = self.text.render("small", header, True, PRIMARY)
             x = 100 + i * col_width + col_width // 2 - header_text.get_width() // 2
             self.screen.blit(header_text, (x, header_y))
         
@@ -375,77 +686,51 @@ class TetrisGame:
                 row_color = TEXT_COLOR if idx % 2 == 0 else (200, 200, 220)
                 
                 # Место
-                place_text = self.small_font.render(str(idx + 1), True, 
+                place_text = self.text.render("small", str(idx + 1), True, 
                                                   PRIMARY if idx < 3 else row_color)
                 self.screen.blit(place_text, (120, row_y))
                 
                 # Имя
-                name_text = self.small_font.render(score[1][:15], True, row_color)
+                name_text = self.text.render("small", score[1][:15], True, row_color)
                 self.screen.blit(name_text, (100 + col_width, row_y))
                 
                 # Счет
-                score_text = self.small_font.render(str(score[2]), True, row_color)
+                score_text = self.text.render("small", str(score[2]), True, row_color)
                 self.screen.blit(score_text, (100 + col_width * 2, row_y))
                 
                 # Уровень
-                level_text = self.small_font.render(str(score[3]), True, row_color)
+                level_text = self.text.render("small", str(score[3]), True, row_color)
                 self.screen.blit(level_text, (100 + col_width * 3, row_y))
                 
                 # Линии
-                lines_text = self.small_font.render(str(score[4]), True, row_color)
+                lines_text = self.text.render("small", str(score[4]), True, row_color)
                 self.screen.blit(lines_text, (100 + col_width * 4, row_y))
                 
                 # Дата
                 date = score[5].strftime("%d.%m.%Y") if isinstance(score[5], datetime) else str(score[5])
-                date_text = self.small_font.render(date, True, row_color)
+                date_text = self.text.render("small", date, True, row_color)
                 self.screen.blit(date_text, (100 + col_width * 5, row_y))
         else:
-            no_data = self.normal_font.render("Нет данных о рекордах", True, (150, 150, 170))
+            message = "Нет данных о рекордах" if loaded else "Загрузка..."
+            no_data = self.text.render("normal", message, True, (150, 150, 170))
             self.screen.blit(no_data, (SCREEN_WIDTH//2 - no_data.get_width()//2, 300))
         
         # Кнопки
         for button in self.buttons:
-            button.draw(self.screen)
-    
-    def check_collision(self, shape, x, y):
-        for shape_y, row in enumerate(shape):
-            for shape_x, cell in enumerate(row):
-                if cell:
-                    if (x + shape_x < 0 or x + shape_x >= GRID_WIDTH or
-                        y + shape_y >= GRID_HEIGHT or
-                        (y + shape_y >= 0 and self.board[y + shape_y][x + shape_x])):
-                        return True
-        return False
-    
-    def merge_piece(self):
-        for y, row in enumerate(self.current_piece.shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    if self.current_piece.y + y >= 0:
-                        self.board[self.current_piece.y + y][self.current_piece.x + x] = self.current_piece.shape_idx + 1
-    
-    def clear_lines(self):
-        lines_to_clear = []
-        for y in range(GRID_HEIGHT):
-            if all(self.board[y]):
-                lines_to_clear.append(y)
-        
-        for line in lines_to_clear:
-            del self.board[line]
-            self.board.insert(0, [0 for _ in range(GRID_WIDTH)])
-        
-        if lines_to_clear:
-            self.lines_cleared += len(lines_to_clear)
-            self.score += (1, 2, 5, 10)[min(len(lines_to_clear) - 1, 3)] * 100 * self.level
-            self.level = self.lines_cleared // 10 + 1
-            self.fall_speed = max(0.1, 0.5 - (self.level - 1) * 0.05)
+            button.draw(self.screen, self.text)
     
     def save_score(self):
+        # Запись в базу идет в фоне, см. ScoreWriter
+        engine = self.engine
+        self.score_writer.submit(self.player_name, engine.score, engine.level, engine.lines_cleared)
+    
+    def insert_score(self, record):
+        # Вызывается из потока ScoreWriter
         try:
             conn = mysql.connector.connect(**DB_CONFIG)
             cursor = conn.cursor()
             query = "INSERT INTO scores (player_name, score, level, lines_cleared) VALUES (%s, %s, %s, %s)"
-            cursor.execute(query, (self.player_name, self.score, self.level, self.lines_cleared))
+            cursor.execute(query, (record["player_name"], record["score"], record["level"], record["lines_cleared"]))
             conn.commit()
             conn.close()
             return True
@@ -454,6 +739,7 @@ class TetrisGame:
             return False
     
     def get_high_scores(self):
+        # Вызывается из потока Leaderboard; None - ошибка, таблица остается прежней
         try:
             conn = mysql.connector.connect(**DB_CONFIG)
             cursor = conn.cursor()
@@ -463,7 +749,7 @@ class TetrisGame:
             return scores
         except Exception as e:
             print(f"Ошибка загрузки рекордов: {e}")
-            return []
+            return None
     
     def run(self):
         running = True
@@ -482,6 +768,9 @@ class TetrisGame:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.VIDEOEXPOSE:
+                    # Окно перекрывалось - частичного обновления недостаточно
+                    self.renderer.invalidate()
                 
                 # Проверка нажатия кнопок
                 for button in self.buttons:
@@ -494,6 +783,7 @@ class TetrisGame:
                                     self.create_buttons()
                                 elif button.text == "ТАБЛИЦА ЛИДЕРОВ":
                                     self.state = "leaders"
+                                    self.leaderboard.open()
                                     self.create_buttons()
                                 elif button.text == "ВЫХОД":
                                     running = False
@@ -507,19 +797,20 @@ class TetrisGame:
                             # Обработка кнопок игры
                             elif self.state == "game":
                                 if button.text == "МЕНЮ":
-                                    if self.game_over:
+                                    if self.engine.game_over:
                                         self.save_score()
                                     self.state = "menu"
                                     self.reset_game()
                                     self.create_buttons()
                                 elif button.text == "РЕСТАРТ":
-                                    if self.game_over:
+                                    if self.engine.game_over:
                                         self.save_score()
                                     self.reset_game()
                             
                             # Обработка кнопок таблицы лидеров
                             elif self.state == "leaders":
                                 if button.text == "НАЗАД":
+                                    self.leaderboard.close()
                                     self.state = "menu"
                                     self.create_buttons()
                 
@@ -527,12 +818,13 @@ class TetrisGame:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
                         if self.state == "game":
-                            if self.game_over:
+                            if self.engine.game_over:
                                 self.save_score()
                             self.state = "menu"
                             self.reset_game()
                             self.create_buttons()
                         elif self.state in ["enter_name", "leaders"]:
+                            self.leaderboard.close()
                             self.state = "menu"
                             self.create_buttons()
                     
@@ -547,68 +839,35 @@ class TetrisGame:
                             self.player_name += event.unicode
                     
                     # Управление игрой
-                    elif self.state == "game" and not self.game_over:
+                    elif self.state == "game" and not self.engine.game_over:
                         if event.key == pygame.K_LEFT:
-                            if not self.check_collision(self.current_piece.shape, 
-                                                       self.current_piece.x - 1, 
-                                                       self.current_piece.y):
-                                self.current_piece.x -= 1
+                            self.engine.move(-1)
                         
                         elif event.key == pygame.K_RIGHT:
-                            if not self.check_collision(self.current_piece.shape, 
-                                                       self.current_piece.x + 1, 
-                                                       self.current_piece.y):
-                                self.current_piece.x += 1
+                            self.engine.move(1)
                         
                         elif event.key == pygame.K_DOWN:
-                            if not self.check_collision(self.current_piece.shape, 
-                                                       self.current_piece.x, 
-                                                       self.current_piece.y + 1):
-                                self.current_piece.y += 1
+                            self.engine.move(0, 1)
                         
                         elif event.key == pygame.K_UP:
-                            rotated = self.current_piece.rotate()
-                            if not self.check_collision(rotated, 
-                                                       self.current_piece.x, 
-                                                       self.current_piece.y):
-                                self.current_piece.shape = rotated
+                            self.engine.rotate()
                         
                         elif event.key == pygame.K_SPACE:
-                            while not self.check_collision(self.current_piece.shape, 
-                                                          self.current_piece.x, 
-                                                          self.current_piece.y + 1):
-                                self.current_piece.y += 1
+                            # Фигура закрепится на следующем шаге гравитации
+                            self.engine.drop(lock=False)
             
             # Логика игры
-            if self.state == "game" and not self.game_over:
-                self.fall_time += delta_time
-                
-                if self.fall_time >= self.fall_speed:
-                    self.fall_time = 0
-                    
-                    if not self.check_collision(self.current_piece.shape, 
-                                              self.current_piece.x, 
-                                              self.current_piece.y + 1):
-                        self.current_piece.y += 1
-                    else:
-                        self.merge_piece()
-                        self.clear_lines()
-                        
-                        self.current_piece = self.next_piece
-                        self.next_piece = Tetromino()
-                        
-                        if self.check_collision(self.current_piece.shape, 
-                                              self.current_piece.x, 
-                                              self.current_piece.y):
-                            self.game_over = True
+            if self.state == "game":
+                self.engine.step(delta_time)
             
             # Отрисовка
+            dirty = None
             if self.state == "menu":
                 self.draw_menu()
             elif self.state == "enter_name":
                 self.draw_enter_name()
             elif self.state == "game":
-                self.draw_game()
+                dirty = self.draw_game()
             elif self.state == "leaders":
                 self.draw_leaders()
             
@@ -616,9 +875,15 @@ class TetrisGame:
             for button in self.buttons:
                 button.check_hover(mouse_pos)
             
-            pygame.display.flip()
+            # Экран игры обновляется только в изменившихся местах
+            if dirty is None:
+                pygame.display.flip()
+            elif dirty:
+                pygame.display.update(dirty)
             self.clock.tick(60)
         
+        self.leaderboard.stop()
+        self.score_writer.stop()
         pygame.quit()
         sys.exit()
 